@@ -0,0 +1,219 @@
+import json
+import time
+import argparse
+import tempfile
+import statistics
+
+import numpy as np
+import pandas as pd
+
+import data_store
+import sections
+from profiling import call_measured
+from streaming import StreamingDataset
+from synthetic import HourModel
+from filter_engine import FilterEngine
+from olap_cube import OlapCube, DAY_CUBE_DIMENSIONS, HOUR_CUBE_DIMENSIONS
+from moment_stats import MomentStats
+
+
+# Fungsi untuk mengukur waktu eksekusi fungsi beberapa kali (dalam milidetik)
+def time_call(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings, result
+
+
+# --- Benchmark Pemuatan Data ---
+# Membandingkan CSV via HTTP, CSV lokal, dan store kolumnar untuk tabel day dan hour
+def bench_load(repeat=5, formats=None, include_http=True):
+    formats = formats or [fmt for fmt in data_store.FORMATS
+                          if fmt == 'npy' or data_store.HAS_PYARROW]
+    rows = []
+    with tempfile.TemporaryDirectory() as store_dir:
+        for fmt in formats:
+            data_store.convert_csv_to_store(fmt, store_dir)
+        for table in data_store.TABLES:
+            sources = []
+            if include_http:
+                sources.append(('csv-http', lambda t=table: data_store.read_csv_typed(
+                    data_store.REMOTE_CSV_URL.format(table=t))))
+            sources.append(('csv-lokal', lambda t=table: data_store.read_csv_typed(
+                data_store.local_csv_path(t))))
+            for fmt in formats:
+                sources.append((fmt, lambda t=table, f=fmt: data_store.read_store(t, f, store_dir)))
+
+            for name, func in sources:
+                try:
+                    timings, df = time_call(func, repeat)
+                except OSError as e:
+                    # Replika tanpa akses jaringan keluar: lewati sumber HTTP
+                    print(f"{table:5s} {name:10s} dilewati ({e})")
+                    continue
+                rows.append({
+                    'table': table,
+                    'source': name,
+                    'rows': len(df),
+                    'median_ms': statistics.median(timings),
+                    'min_ms': min(timings),
+                })
+    return rows
+
+
+def print_rows(rows):
+    for row in rows:
+        print(f"{row['table']:5s} {row['source']:10s} rows={row['rows']:>7d} "
+              f"median={row['median_ms']:8.2f} ms  min={row['min_ms']:8.2f} ms")
+
+
+# --- Laporan Memori ---
+# Ukuran per baris tabel day/hour untuk setiap tata letak (lihat data_store.memory_report)
+def print_memory_rows(rows):
+    for row in rows:
+        print(f"{row['table']:5s} {row['layout']:15s} rows={row['rows']:>7d} kolom={row['columns']:>3d} "
+              f"{row['bytes'] / 1024:9.1f} KiB  {row['bytes_per_row']:7.1f} B/baris")
+
+
+# --- Benchmark Jalur Section (Headless) ---
+SCALES = [1, 10, 100]
+PERCENTILES = [50, 95, 99]
+
+# Kombinasi filter tetap: (label, awal dan akhir sebagai fraksi rentang tanggal, musim, cuaca)
+FILTER_COMBINATIONS = [
+    ('semua', 0.0, 1.0, [], []),
+    ('paruh-akhir', 0.5, 1.0, [], []),
+    ('summer', 0.0, 1.0, ['Summer'], []),
+    ('cerah', 0.0, 1.0, [], ['Clear/Cloudy']),
+    ('fall-winter-mist', 0.25, 0.75, ['Fall', 'Winter'], ['Mist/Cloudy']),
+    ('satu-bulan', 0.40, 0.44, [], []),
+]
+
+
+# Jalur data yang diukur: 'static' = jalur default dashboard (tabel harian dari file, FilterEngine dan
+# cube harian atas tabel harian, cube jam-an di memori); 'streaming' = tabel harian diturunkan dari
+# roll-up jam-an (StreamingDataset, kondisi cuaca harian = kondisi jam-an terbanyak)
+DATA_PATHS = ['static', 'streaming']
+
+
+# Fungsi untuk membuat data N kali tabel asli: skala 1 memakai tabel asli, skala lebih besar memakai
+# generator synthetic.py (pola dipelajari dari tabel jam-an) sepanjang N kali rentang tanggal asli,
+# sehingga musim, hari libur, dan kolom kalender lain selalu konsisten dengan tanggalnya. Tabel harian
+# data sintetis diturunkan dari roll-up jam-annya (sama seperti mode streaming).
+def scaled_tables(base_days, base_hours, factor, model=None, seed=0):
+    if factor == 1:
+        return base_days, base_hours
+    model = model or HourModel(base_hours)
+    days = ((base_hours['date'].max() - base_hours['date'].min()).days + 1) * factor
+    hour_df = pd.concat(model.generate(base_hours['date'].min(), days, seed=seed), ignore_index=True)
+    day_df = StreamingDataset(hour_df).day_table() if base_days is not None else None
+    return day_df, hour_df
+
+
+# Fungsi untuk membangun sumber data section (mesin filter harian, cube harian, cube jam-an, statistik harian)
+def build_sources(data_path, day_df, hour_df):
+    if data_path == 'streaming':
+        dataset = StreamingDataset(hour_df)
+        return dataset.day_engine, dataset.day_cube, dataset.hour_cube, dataset.day_stats
+    # Sama dengan load_filter_engine/load_cubes/load_day_stats di dashboard.py dengan backend jam-an 'memory'
+    return (FilterEngine(day_df), OlapCube(day_df, DAY_CUBE_DIMENSIONS),
+            OlapCube(hour_df, HOUR_CUBE_DIMENSIONS), MomentStats(day_df))
+
+
+def filter_args(engine, combination):
+    _, lo, hi, seasons_filter, weather_filter = combination
+    span = engine.max_date - engine.min_date
+    return (engine.min_date + span * lo, engine.min_date + span * hi, seasons_filter, weather_filter)
+
+
+def percentile_row(timings):
+    return {f'p{p}_ms': float(np.percentile(timings, p)) for p in PERCENTILES}
+
+
+# Menjalankan jalur data dashboard tanpa Streamlit: bangun sumber data (mesin filter, cube, statistik)
+# untuk jalur data yang dipilih, lalu hitung (dan opsional render) setiap section untuk setiap kombinasi filter
+def bench_sections(scales=SCALES, repeat=3, render=False, trace_memory=False, data_path='static'):
+    base_days = data_store.load_table('day') if data_path == 'static' else None
+    base_hours = data_store.load_table('hour')
+    model = HourModel(base_hours) if any(factor > 1 for factor in scales) else None
+    results = []
+    for factor in scales:
+        day_df, hour_df = scaled_tables(base_days, base_hours, factor, model, seed=factor)
+        sources, build_stats = call_measured(build_sources, data_path, day_df, hour_df, trace_memory=trace_memory)
+        engine = sources[0]
+        section_timings = {name: [] for name in sections.SECTIONS}
+        render_timings = {name: [] for name in sections.SECTIONS if sections.has_figure(name)}
+        rerun_timings = []
+        for combination in FILTER_COMBINATIONS:
+            args = filter_args(engine, combination)
+            for _ in range(repeat):
+                start = time.perf_counter()
+                ctx = sections.SectionContext(*sources, *args)
+                for name in sections.SECTIONS:
+                    data, stats = call_measured(sections.compute_section, name, ctx, trace_memory=trace_memory)
+                    section_timings[name].append(stats['wall_ms'])
+                    if render and data is not None and sections.has_figure(name):
+                        _, stats = call_measured(sections.render_image, name, data, trace_memory=trace_memory)
+                        render_timings[name].append(stats['wall_ms'])
+                rerun_timings.append((time.perf_counter() - start) * 1000)
+
+        scale_info = {'path': data_path, 'scale': factor, 'hour_rows': len(hour_df), 'days': len(engine),
+                      'build_ms': build_stats['wall_ms'], 'build_peak_kib': build_stats['peak_kib']}
+        for stage, timings_by_name in [('aggregate', section_timings), ('render', render_timings)]:
+            for name, timings in timings_by_name.items():
+                if timings:
+                    results.append({**scale_info, 'stage': stage, 'section': name, **percentile_row(timings)})
+        rerun = {**scale_info, 'stage': 'rerun', 'section': None, **percentile_row(rerun_timings)}
+        # Throughput: rerun per detik dan baris jam-an yang dilayani per detik (median rerun)
+        rerun['reruns_per_s'] = 1000 / statistics.median(rerun_timings)
+        rerun['hour_rows_per_s'] = len(hour_df) * rerun['reruns_per_s']
+        results.append(rerun)
+    return results
+
+
+def print_section_rows(rows):
+    for row in rows:
+        line = (f"{row['path']:9s} x{row['scale']:<4d} {row['stage']:9s} {row['section'] or '-':16s} "
+                + "  ".join(f"p{p}={row[f'p{p}_ms']:9.2f} ms" for p in PERCENTILES))
+        if row['stage'] == 'rerun':
+            line += (f"  {row['reruns_per_s']:.1f} rerun/s  {row['hour_rows_per_s']:,.0f} baris/s"
+                     f"  (build {row['build_ms']:.0f} ms, {row['hour_rows']:,} baris jam-an)")
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark jalur data dashboard.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    load_parser = subparsers.add_parser("load", help="Benchmark waktu pemuatan data")
+    load_parser.add_argument("--repeat", type=int, default=5)
+    load_parser.add_argument("--no-http", action="store_true", help="Jangan uji CSV via HTTP")
+
+    subparsers.add_parser("memory", help="Laporan memori per baris: CSV default pandas, skema bertipe, skema ringkas")
+
+    sections_parser = subparsers.add_parser("sections", help="Benchmark agregasi/render section dengan data sintetis")
+    sections_parser.add_argument("--scales", type=int, nargs='+', default=SCALES, help="Faktor skala tabel jam-an")
+    sections_parser.add_argument("--repeat", type=int, default=3, help="Pengulangan per kombinasi filter")
+    sections_parser.add_argument("--render", action="store_true", help="Ukur juga render figure (lambat)")
+    sections_parser.add_argument("--path", choices=DATA_PATHS, default='static',
+                                 help="Jalur data: static (default dashboard) atau streaming")
+    sections_parser.add_argument("--memory", action="store_true", help="Ukur puncak memori dengan tracemalloc")
+    sections_parser.add_argument("--json", default=None, help="Simpan hasil sebagai file JSON")
+
+    args = parser.parse_args(argv)
+    if args.command == "load":
+        print_rows(bench_load(args.repeat, include_http=not args.no_http))
+    elif args.command == "memory":
+        print_memory_rows(data_store.memory_report())
+    elif args.command == "sections":
+        rows = bench_sections(args.scales, args.repeat, args.render, args.memory, args.path)
+        print_section_rows(rows)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(rows, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
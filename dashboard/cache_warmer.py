@@ -0,0 +1,218 @@
+import os
+import json
+import time
+import atexit
+import hashlib
+import threading
+import contextlib
+
+import pandas as pd
+
+import data_store
+import sections
+from olap_cube import OlapCube
+from chart_cache import CacheEntry, normalize_filter
+from profiling import logger
+
+# Versi format entri cache; dinaikkan jika bentuk data section berubah agar entri disk lama tidak dipakai
+CACHE_FORMAT_VERSION = 3
+# Nama entri cache untuk frame harian yang sudah difilter (di samping entri per section)
+FILTERED_FRAME = 'filtered_day'
+# Jeda minimum (detik) antara dua putaran pemanasan; versi data yang datang selama putaran berjalan
+# atau selama jeda digabung menjadi satu putaran untuk versi terbaru
+WARM_DEBOUNCE = 5.0
+
+# Preset filter yang dipanaskan di latar belakang: tanpa start/end berarti rentang penuh,
+# tanpa seasons/weather berarti semua kategori (tampilan default dashboard)
+DEFAULT_PRESETS = [
+    {'name': 'Default'},
+    {'name': 'Spring', 'seasons': ['Spring']},
+    {'name': 'Summer', 'seasons': ['Summer']},
+    {'name': 'Fall', 'seasons': ['Fall']},
+    {'name': 'Winter', 'seasons': ['Winter']},
+]
+
+
+# Preset bisa diatur lewat DASHBOARD_CACHE_PRESETS: JSON list langsung atau path file JSON
+# (daftar kosong menonaktifkan pemanasan cache)
+def presets_from_env():
+    value = os.environ.get('DASHBOARD_CACHE_PRESETS')
+    if not value:
+        return DEFAULT_PRESETS
+    if value.lstrip().startswith('['):
+        return json.loads(value)
+    with open(value) as f:
+        return json.load(f)
+
+
+# Fungsi untuk menerjemahkan preset menjadi argumen filter sidebar (tanggal awal/akhir, musim, cuaca)
+def preset_filter(preset, day_engine):
+    start_date = pd.Timestamp(preset.get('start') or day_engine.min_date).date()
+    end_date = pd.Timestamp(preset.get('end') or day_engine.max_date).date()
+    seasons_filter = list(preset.get('seasons') or day_engine.categories('season'))
+    weather_filter = list(preset.get('weather') or day_engine.categories('weather_condition'))
+    return start_date, end_date, seasons_filter, weather_filter
+
+
+# Fungsi untuk membuat kunci cache filter (sama dengan kunci yang dipakai halaman dashboard).
+# "Semua kategori" diukur terhadap kategori skema, bukan kategori tabel harian: tabel jam-an bisa
+# memuat kategori yang tidak ada di tabel harian (mis. 'Heavy Rain/Fog')
+def filter_cache_key(day_engine, start_date, end_date, seasons_filter, weather_filter, data_key):
+    return normalize_filter(start_date, end_date, seasons_filter, weather_filter,
+                            data_store.CATEGORICAL_DTYPES['season'].categories,
+                            data_store.CATEGORICAL_DTYPES['weather_condition'].categories) + (data_key,)
+
+
+def _hour_token(hour_cube):
+    # Cube di memori diwakili total selnya; backend out-of-core diwakili path dan waktu ubah file terbaru store
+    if isinstance(hour_cube, OlapCube):
+        if not len(hour_cube):
+            return [0]
+        totals = hour_cube.rollup([], hour_cube.engine.min_date, hour_cube.engine.max_date)
+        return [len(hour_cube)] + totals.round(6).values.tolist()
+    path = getattr(hour_cube, 'path', '')
+    return [type(hour_cube).__name__, path, data_store.store_mtime(path) if os.path.exists(path) else None]
+
+
+# Sidik data: hash dari rentang tanggal, total cube harian, sumber data jam-an, dan versi data
+# streaming. Dipakai sebagai bagian kunci cache agar entri (juga di disk, dibagi antar proses)
+# tidak pernah dipakai untuk data yang berbeda.
+def data_fingerprint(day_engine, day_cube, hour_cube, version=None):
+    totals = day_cube.rollup([], day_engine.min_date, day_engine.max_date)
+    token = [
+        CACHE_FORMAT_VERSION,
+        str(day_engine.min_date), str(day_engine.max_date), len(day_cube),
+        totals.round(6).values.tolist(), _hour_token(hour_cube), version,
+    ]
+    return hashlib.sha256(json.dumps(token, default=str).encode()).hexdigest()[:16]
+
+
+# Pemanasan cache di latar belakang: untuk setiap preset, frame harian terfilter, agregat section,
+# dan gambar section dihitung lalu disimpan di cache bersama, sehingga permintaan pertama untuk
+# preset hanya mengirim bytes dari cache. Dijalankan saat startup dan setiap kali data berubah
+# (kunci data baru). Hanya satu putaran berjalan pada satu waktu: kunci data yang dijadwalkan selama
+# putaran berjalan menunggu putaran itu selesai (hanya yang terbaru yang dipanaskan), dan putaran
+# berhenti lebih awal jika datanya sudah usang (current() mengembalikan False).
+class CacheWarmer:
+    def __init__(self, chart_cache, render_pool, presets=None, debounce=WARM_DEBOUNCE):
+        self.chart_cache = chart_cache
+        self.render_pool = render_pool
+        self.presets = presets_from_env() if presets is None else presets
+        self.debounce = debounce
+        self._condition = threading.Condition()
+        self._scheduled_key = None
+        self._pending = None
+        self._thread = None
+        self._stopping = False
+        self._last_run = float('-inf')
+        # Thread dihentikan dengan rapi saat proses selesai (bukan dimatikan di tengah kode native)
+        atexit.register(self.stop)
+        self.metrics = {
+            'state': 'idle', 'runs': 0, 'data_key': None,
+            'presets': len(self.presets), 'presets_warmed': 0,
+            'sections_built': 0, 'sections_cached': 0, 'renders': 0,
+            'duration_ms': None, 'errors': 0, 'last_error': None,
+        }
+
+    # Fungsi untuk menjadwalkan pemanasan untuk data_key; tidak melakukan apa pun jika data_key
+    # sudah dijadwalkan. sources = (day_engine, day_cube, hour_cube, day_stats), lock melindungi
+    # data yang bisa berubah dan current() memeriksa (di bawah lock) bahwa sources masih versi data
+    # terbaru (mode streaming). renders=False hanya memanaskan agregat; gambar dirender oleh halaman.
+    def schedule(self, data_key, sources, lock=None, current=None, renders=True):
+        if not self.presets or self._stopping:
+            return False
+        with self._condition:
+            if data_key == self._scheduled_key:
+                return False
+            self._scheduled_key = data_key
+            self._pending = (data_key, sources, lock or contextlib.nullcontext(), current or (lambda: True), renders)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='cache-warmer', daemon=True)
+                self._thread.start()
+        return True
+
+    def _run(self):
+        while True:
+            with self._condition:
+                # Jeda antar putaran: jadwal yang datang selama jeda menimpa _pending, sehingga
+                # rentetan versi data hanya memicu satu putaran untuk versi terbaru
+                delay = self._last_run + self.debounce - time.monotonic()
+                if delay > 0 and not self._stopping:
+                    self._condition.wait(delay)
+                job, self._pending = self._pending, None
+                if job is None:
+                    self._thread = None
+                    return
+            self._warm(*job)
+            self._last_run = time.monotonic()
+
+    def _cancelled(self, current):
+        return self._stopping or not current()
+
+    # Fungsi untuk menghentikan pemanasan: putaran berjalan berhenti setelah section yang sedang dihitung
+    def stop(self, timeout=30):
+        with self._condition:
+            self._stopping = True
+            self._pending = None
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _warm(self, data_key, sources, lock, current, renders):
+        start = time.perf_counter()
+        self.metrics.update({'state': 'running', 'data_key': data_key, 'presets_warmed': 0,
+                             'sections_built': 0, 'sections_cached': 0, 'renders': 0})
+        for preset in self.presets:
+            if self._cancelled(current):
+                break
+            try:
+                if self.warm_preset(preset, data_key, sources, lock, current, renders):
+                    self.metrics['presets_warmed'] += 1
+            except Exception as e:
+                # Kegagalan satu preset tidak menghentikan preset lain; halaman tetap menghitung sendiri
+                self.metrics['errors'] += 1
+                self.metrics['last_error'] = f"{preset.get('name')}: {e!r}"
+                logger.exception("Pemanasan cache gagal untuk preset %s", preset.get('name'))
+        self.metrics['runs'] += 1
+        self.metrics['duration_ms'] = (time.perf_counter() - start) * 1000
+        with self._condition:
+            self.metrics['state'] = 'idle' if self._pending is None or self._stopping else 'waiting'
+        logger.info(json.dumps({'event': 'cache_warmup', **{k: v for k, v in self.metrics.items() if k != 'state'}}))
+
+    # Fungsi untuk memanaskan satu preset (bisa juga dipanggil langsung, mis. dari skrip);
+    # mengembalikan False jika dihentikan sebelum selesai. Dengan renders=False, section bergambar
+    # disimpan tanpa gambar (image None) dan dirender oleh halaman saat pertama kali diminta.
+    def warm_preset(self, preset, data_key, sources, lock=contextlib.nullcontext(), current=lambda: True, renders=True):
+        day_engine = sources[0]
+        filter_args = preset_filter(preset, day_engine)
+        filter_key = filter_cache_key(day_engine, *filter_args, data_key)
+        section_context = sections.SectionContext(*sources, *filter_args)
+        pending_renders = {}
+        with lock:
+            # Data sudah berubah sejak dijadwalkan: agregat tidak lagi cocok dengan data_key
+            if self._cancelled(current):
+                return False
+            frame_key = (filter_key, FILTERED_FRAME)
+            if self.chart_cache.get(frame_key, count=False) is None:
+                self.chart_cache.put(frame_key, CacheEntry(section_context.day_df, None))
+            for section_name in sections.SECTIONS:
+                if self._stopping:
+                    return False
+                if self.chart_cache.get((filter_key, section_name), count=False) is not None:
+                    self.metrics['sections_cached'] += 1
+                    continue
+                section_data = sections.compute_section(section_name, section_context)
+                self.metrics['sections_built'] += 1
+                if renders and section_data is not None and sections.has_figure(section_name):
+                    pending_renders[section_name] = section_data
+                else:
+                    self.chart_cache.put((filter_key, section_name), CacheEntry(section_data, None))
+        # Render dilakukan di luar lock data (mode streaming) agar ingest tidak tertahan
+        for section_name, image in self.render_pool.render_many(pending_renders).items():
+            self.chart_cache.put((filter_key, section_name), CacheEntry(pending_renders[section_name], image))
+            self.metrics['renders'] += 1
+        return True
+
+    def stats(self):
+        return dict(self.metrics)
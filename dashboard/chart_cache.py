@@ -0,0 +1,231 @@
+import os
+import sys
+import time
+import pickle
+import hashlib
+import threading
+import contextlib
+from collections import OrderedDict, namedtuple
+
+import pandas as pd
+
+# Satu entri cache: data agregat section dan bytes gambar hasil render (None jika tidak ada figure)
+CacheEntry = namedtuple('CacheEntry', ['data', 'image'])
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_DISK_MAX_BYTES = 1024 * 1024 * 1024
+# Statistik disk (hasil scan direktori) dipakai ulang selama beberapa detik agar tidak memindai
+# direktori cache pada setiap rerun
+DISK_STATS_MAX_AGE = 30
+
+
+# Cache disk aktif jika environment variable DASHBOARD_CACHE_DIR berisi path direktori
+def disk_dir_from_env():
+    return os.environ.get('DASHBOARD_CACHE_DIR') or None
+
+
+# Fungsi untuk menormalkan pilihan filter menjadi tuple yang bisa dijadikan kunci cache.
+# Filter kosong dan filter yang memuat semua kategori menghasilkan data yang sama, jadi disamakan.
+# all_seasons/all_weather harus memuat semua kategori yang bisa muncul di tabel mana pun (harian
+# maupun jam-an); jika hanya kategori tabel harian, pilihan "semua kategori harian" tetap membuang
+# baris jam-an berkategori lain sehingga datanya berbeda dari filter kosong.
+def normalize_filter(start_date, end_date, seasons_filter, weather_filter, all_seasons=(), all_weather=()):
+    def normalize_selection(selected, all_values):
+        if not selected or set(all_values) <= set(selected):
+            return ('*',)
+        return tuple(sorted(selected))
+
+    return (
+        pd.Timestamp(start_date).date().isoformat(),
+        pd.Timestamp(end_date).date().isoformat(),
+        normalize_selection(seasons_filter, all_seasons),
+        normalize_selection(weather_filter, all_weather),
+    )
+
+
+# Fungsi untuk memperkirakan ukuran memori sebuah nilai yang disimpan di cache (dalam byte)
+def estimate_size(value):
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(value, pd.DataFrame) else int(usage)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+# Store cache di disk lokal: satu file pickle per entri (nama file = hash kunci), sehingga beberapa
+# proses server di mesin yang sama bisa berbagi hasil agregasi dan gambar. File ditulis atomik
+# (file sementara + os.replace); eviction LRU memakai waktu akses terakhir (mtime) file.
+class DiskStore:
+    def __init__(self, directory, max_bytes=DEFAULT_DISK_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._written = 0
+        self._stats = None
+        self._stats_time = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha256(repr(key).encode()).hexdigest() + '.pkl')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                stored_key, entry = pickle.load(f)
+            os.utime(path)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        # Kunci disimpan bersama entri untuk menghindari tabrakan hash
+        return entry if stored_key == key else None
+
+    def put(self, key, entry):
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        # Disk penuh atau tidak bisa ditulis tidak boleh menggagalkan halaman: entri tetap ada di memori
+        try:
+            with open(temp_path, 'wb') as f:
+                pickle.dump((key, entry), f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+            os.replace(temp_path, path)
+        except (OSError, pickle.PicklingError):
+            with contextlib.suppress(OSError):
+                os.remove(temp_path)
+            return
+        self._written += size
+        if self._written > self.max_bytes // 10:
+            self.prune()
+
+    def _files(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.pkl'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def _set_stats(self, entries, total):
+        self._stats = {'entries': entries, 'bytes': total, 'max_bytes': self.max_bytes}
+        self._stats_time = time.monotonic()
+
+    # Fungsi untuk menghapus file yang paling lama tidak diakses sampai total ukuran di bawah batas
+    def prune(self):
+        self._written = 0
+        files = sorted(self._files())
+        total = sum(size for _, size, _ in files)
+        entries = len(files)
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(OSError):
+                os.remove(path)
+            total -= size
+            entries -= 1
+        self._set_stats(entries, total)
+
+    # Statistik direktori cache; direktori hanya dipindai ulang jika hasil terakhir lebih tua dari max_age detik
+    def stats(self, max_age=DISK_STATS_MAX_AGE):
+        if self._stats is None or time.monotonic() - self._stats_time > max_age:
+            files = self._files()
+            self._set_stats(len(files), sum(size for _, size, _ in files))
+        return dict(self._stats)
+
+
+# Cache LRU yang dibatasi total ukuran memori; aman dipakai bersama oleh banyak sesi Streamlit.
+# Jika diberi DiskStore, entri yang tidak ada di memori dicari di disk dan setiap entri baru ikut ditulis ke disk.
+class ChartCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, disk=None):
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    # count=False: pencarian tanpa memengaruhi statistik hit/miss (dipakai pemanasan cache)
+    def get(self, key, count=True):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if count:
+                    self.hits += 1
+                return entry
+        entry = self.disk.get(key) if self.disk is not None else None
+        with self._lock:
+            if count:
+                if entry is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                    self.disk_hits += 1
+        if entry is not None:
+            self.put(key, entry, persist=False)
+        return entry
+
+    # persist=False: hanya disimpan di memori (mis. entri yang baru saja dibaca dari disk)
+    def put(self, key, entry, persist=True):
+        if persist and self.disk is not None:
+            self.disk.put(key, entry)
+        size = estimate_size(entry.data) + estimate_size(entry.image)
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._sizes.pop(key)
+                del self._entries[key]
+            # Entri yang lebih besar dari seluruh kapasitas tidak disimpan
+            if size > self.max_bytes:
+                return entry
+            self._entries[key] = entry
+            self._sizes[key] = size
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                old_key, _ = self._entries.popitem(last=False)
+                self.total_bytes -= self._sizes.pop(old_key)
+                self.evictions += 1
+        return entry
+
+    # Fungsi untuk mengambil entri dari cache, atau membuatnya dengan `build()` jika belum ada
+    def get_or_build(self, key, build):
+        entry = self.get(key)
+        if entry is None:
+            entry = self.put(key, build())
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'disk_hits': self.disk_hits,
+                'hit_rate': self.hits / requests if requests else 0.0,
+            }
@@ -0,0 +1,148 @@
+import numpy as np
+
+
+# Fungsi untuk menghitung jumlah kuadrat galat (SSE) segmen x[i..j] (inklusif) dari prefix sum
+def _segment_cost(s1, s2, i, j):
+    size = j - i + 1
+    total = s1[j + 1] - s1[i]
+    return (s2[j + 1] - s2[i]) - total * total / size
+
+
+# Fungsi untuk mengambil argmin pertama per segmen dari array nilai yang digabung (flat)
+def _segment_argmin(values, lengths):
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    mins = np.minimum.reduceat(values, starts)
+    candidates = np.flatnonzero(values <= np.repeat(mins, lengths))
+    segments = np.repeat(np.arange(len(lengths)), lengths)[candidates]
+    _, first = np.unique(segments, return_index=True)
+    return candidates[first], mins
+
+
+# K-means 1-D optimal (natural breaks Jenks, meminimalkan SSE dalam kelas) dengan dynamic
+# programming atas data terurut. Setiap lapisan DP diselesaikan dengan divide-and-conquer
+# (titik potong optimal monoton), dan setiap level rekursi dihitung sekaligus secara
+# vektor NumPy, sehingga biayanya O(k n log n) dan tetap cepat untuk puluhan ribu nilai.
+# Mengembalikan label cluster (0 = nilai terendah) dalam urutan input dan batas atas tiap cluster.
+def optimal_kmeans_1d(values, k):
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    if n == 0:
+        return np.empty(0, dtype=np.intp), np.empty(0)
+    k = max(1, min(k, len(np.unique(values))))
+    order = np.argsort(values, kind='stable')
+    x = values[order]
+    s1 = np.concatenate([[0.0], np.cumsum(x)])
+    s2 = np.concatenate([[0.0], np.cumsum(x * x)])
+
+    cost = np.full((k, n), np.inf)
+    start = np.zeros((k, n), dtype=np.intp)
+    cost[0] = _segment_cost(s1, s2, np.zeros(n, dtype=np.intp), np.arange(n))
+    for m in range(1, k):
+        # Segmen rekursi: indeks akhir j di [jlo, jhi] dengan kandidat awal cluster i di [ilo, ihi]
+        jlo, jhi = np.array([m]), np.array([n - 1])
+        ilo, ihi = np.array([m]), np.array([n - 1])
+        while len(jlo):
+            mid = (jlo + jhi) // 2
+            top = np.minimum(ihi, mid)
+            lengths = top - ilo + 1
+            offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            i = np.repeat(ilo, lengths) + offsets
+            j = np.repeat(mid, lengths)
+            best, mins = _segment_argmin(cost[m - 1][i - 1] + _segment_cost(s1, s2, i, j), lengths)
+            cost[m][mid] = mins
+            start[m][mid] = i[best]
+            split = i[best]
+            left = jlo <= mid - 1
+            right = mid + 1 <= jhi
+            jlo, jhi, ilo, ihi = (
+                np.concatenate([jlo[left], mid[right] + 1]),
+                np.concatenate([mid[left] - 1, jhi[right]]),
+                np.concatenate([ilo[left], split[right]]),
+                np.concatenate([split[left], ihi[right]]),
+            )
+
+    # Telusuri balik titik potong dari cluster terakhir
+    sorted_labels = np.empty(n, dtype=np.intp)
+    breaks = np.empty(k)
+    end = n - 1
+    for m in range(k - 1, -1, -1):
+        begin = start[m][end] if m else 0
+        sorted_labels[begin:end + 1] = m
+        breaks[m] = x[end]
+        end = begin - 1
+    labels = np.empty(n, dtype=np.intp)
+    labels[order] = sorted_labels
+    return labels, breaks
+
+
+def _squared_distances(x, centers):
+    return (x * x).sum(axis=1)[:, None] - 2 * x @ centers.T + (centers * centers).sum(axis=1)[None, :]
+
+
+# Inisialisasi k-means++ pada sampel data (pusat awal yang saling berjauhan)
+def _kmeans_plus_plus(x, k, rng):
+    centers = [x[rng.integers(len(x))]]
+    distances = _squared_distances(x, np.array(centers))[:, 0]
+    for _ in range(1, k):
+        weights = np.clip(distances, 0, None)
+        total = weights.sum()
+        index = rng.choice(len(x), p=weights / total) if total > 0 else rng.integers(len(x))
+        centers.append(x[index])
+        distances = np.minimum(distances, _squared_distances(x, x[index][None, :])[:, 0])
+    return np.array(centers)
+
+
+# Fungsi untuk memberi label cluster terdekat per blok agar memori tetap terbatas untuk data besar
+def assign_clusters(x, centers, block_size=65536):
+    labels = np.empty(len(x), dtype=np.intp)
+    for lo in range(0, len(x), block_size):
+        labels[lo:lo + block_size] = _squared_distances(x[lo:lo + block_size], centers).argmin(axis=1)
+    return labels
+
+
+# Mini-batch k-means (Sculley) untuk banyak fitur: fitur distandarkan (z-score), pusat awal
+# k-means++ dari sampel, lalu pusat diperbarui per batch kecil dengan laju belajar 1/jumlah anggota.
+# Seed tetap agar hasil untuk filter yang sama selalu sama (aman di-cache).
+# Mengembalikan label cluster dan pusat cluster dalam satuan asli fitur.
+def minibatch_kmeans(features, k, batch_size=1024, max_iter=100, tol=1e-4, seed=0):
+    x = np.asarray(features, dtype=np.float64)
+    if x.ndim == 1:
+        x = x[:, None]
+    n = len(x)
+    if n == 0:
+        return np.empty(0, dtype=np.intp), np.empty((0, x.shape[1]))
+    k = max(1, min(k, n))
+    mean = x.mean(axis=0)
+    scale = x.std(axis=0)
+    scale[scale == 0] = 1.0
+    z = (x - mean) / scale
+
+    rng = np.random.default_rng(seed)
+    sample = z[rng.choice(n, size=min(n, max(10 * k, batch_size)), replace=False)]
+    centers = _kmeans_plus_plus(sample, k, rng)
+    counts = np.zeros(k)
+    for _ in range(max_iter):
+        batch = z[rng.choice(n, size=min(n, batch_size), replace=False)]
+        nearest = _squared_distances(batch, centers).argmin(axis=1)
+        previous = centers.copy()
+        batch_counts = np.bincount(nearest, minlength=k)
+        batch_sums = np.stack([np.bincount(nearest, weights=batch[:, f], minlength=k) for f in range(z.shape[1])], axis=1)
+        counts += batch_counts
+        updated = batch_counts > 0
+        # Rata-rata berjalan: pusat bergerak ke rata-rata batch sebanding porsi anggota baru
+        rate = batch_counts[updated] / counts[updated]
+        centers[updated] += rate[:, None] * (batch_sums[updated] / batch_counts[updated][:, None] - centers[updated])
+        if np.abs(centers - previous).max() < tol:
+            break
+
+    labels = assign_clusters(z, centers)
+    return labels, centers * scale + mean
+
+
+# Fungsi untuk mengurutkan ulang label agar cluster 0 memiliki nilai kunci (mis. total penyewaan) terendah
+def order_labels(labels, key_values):
+    k = int(labels.max()) + 1 if len(labels) else 0
+    means = np.bincount(labels, weights=key_values, minlength=k) / np.maximum(np.bincount(labels, minlength=k), 1)
+    rank = np.empty(k, dtype=np.intp)
+    rank[np.argsort(means, kind='stable')] = np.arange(k)
+    return rank[labels]
@@ -0,0 +1,457 @@
+import os
+import io
+import glob
+import json
+import argparse
+import warnings
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+
+# pyarrow bersifat opsional: tanpa pyarrow, store memakai kolom NumPy (.npy) yang di-memory-map
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# --- Lokasi Data ---
+DASHBOARD_DIR = os.path.dirname(os.path.abspath(__file__))
+STORE_DIR = os.path.join(DASHBOARD_DIR, "store")
+TABLES = ['day', 'hour']
+FORMATS = ['parquet', 'feather', 'npy']
+
+# URL lama, hanya dipakai sebagai cadangan jika file CSV lokal tidak ada
+REMOTE_CSV_URL = "https://raw.githubusercontent.com/nurimammasri/Belajar-Analisis-Data-Python-Dicoding/refs/heads/main/dashboard/dashboard_main_data_{table}.csv"
+
+
+def local_csv_path(table):
+    return os.path.join(DASHBOARD_DIR, f"dashboard_main_data_{table}.csv")
+
+
+# --- Skema Kolom Bertipe ---
+# Urutan kategori sama dengan urutan yang dipakai untuk plot di dashboard
+SEASON_CATEGORIES = ['Spring', 'Summer', 'Fall', 'Winter']
+MONTH_CATEGORIES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+WEEKDAY_CATEGORIES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+WORKINGDAY_CATEGORIES = ['Non-Working Day', 'Working Day']
+WEATHER_CATEGORIES = ['Clear/Cloudy', 'Mist/Cloudy', 'Light Snow/Rain', 'Heavy Rain/Fog']
+
+CATEGORICAL_DTYPES = {
+    'season': CategoricalDtype(SEASON_CATEGORIES),
+    'month': CategoricalDtype(MONTH_CATEGORIES),
+    'weekday': CategoricalDtype(WEEKDAY_CATEGORIES),
+    'workingday': CategoricalDtype(WORKINGDAY_CATEGORIES),
+    'weather_condition': CategoricalDtype(WEATHER_CATEGORIES),
+    'holiday': CategoricalDtype([0, 1]),
+    'hour': CategoricalDtype(list(range(24))),
+}
+
+# Kolom numerik disimpan dengan tipe yang ringkas
+NUMERIC_DTYPES = {
+    'temperature': 'float32',
+    'feeling_temperature': 'float32',
+    'humidity': 'float32',
+    'windspeed': 'float32',
+    'casual': 'int32',
+    'registered': 'int32',
+    'total_rentals': 'int32',
+    'month_num': 'int8',
+    # Kolom tambahan data sintetis multi-stasiun
+    'station': 'int32',
+}
+
+
+# Fungsi untuk menerapkan skema bertipe ke dataframe dengan kolom dashboard
+def apply_schema(df):
+    df = df.copy()
+    if not pd.api.types.is_datetime64_any_dtype(df['date']):
+        df['date'] = pd.to_datetime(df['date'])
+    for col, dtype in CATEGORICAL_DTYPES.items():
+        if col in df.columns and df[col].dtype != dtype:
+            df[col] = df[col].astype(dtype)
+    # Kategori tahun diambil dari data agar tetap benar untuk data multi-tahun
+    if 'year' in df.columns and not isinstance(df['year'].dtype, CategoricalDtype):
+        df['year'] = df['year'].astype('int16').astype('category')
+    for col, dtype in NUMERIC_DTYPES.items():
+        if col in df.columns:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+# Fungsi untuk membaca CSV dashboard langsung ke tipe yang benar (tanpa parsing semua kolom sebagai teks)
+def read_csv_typed(path_or_url, **kwargs):
+    dtype = dict(CATEGORICAL_DTYPES)
+    dtype.update(NUMERIC_DTYPES)
+    dtype['year'] = 'int16'
+    df = pd.read_csv(path_or_url, dtype=dtype, parse_dates=['date'], **kwargs)
+    return apply_schema(df)
+
+
+# --- Skema Ringkas (opsional) ---
+# Kolom kalender yang dapat diturunkan dari 'date' ('workingday' dari 'date' + 'holiday'); pada skema
+# ringkas kolom ini tidak disimpan dan hanya dihitung saat dibutuhkan, untuk baris yang dibutuhkan
+DERIVED_CALENDAR_COLUMNS = ['year', 'month', 'month_num', 'weekday', 'workingday']
+COUNT_COLUMNS = ['casual', 'registered', 'total_rentals']
+
+
+# Skema ringkas aktif jika environment variable DASHBOARD_COMPACT_SCHEMA=1
+def compact_from_env():
+    return os.environ.get('DASHBOARD_COMPACT_SCHEMA', '0') not in ('', '0', 'false')
+
+
+# Fungsi untuk mengubah dataframe bertipe ke skema ringkas: kolom kalender turunan dibuang dan
+# jumlah penyewaan disimpan sebagai uint16 (atau uint32 jika nilainya tidak muat)
+def compact_schema(df):
+    df = apply_schema(df).drop(columns=[col for col in DERIVED_CALENDAR_COLUMNS if col in df.columns])
+    for col in COUNT_COLUMNS:
+        if col in df.columns:
+            fits = df[col].empty or (df[col].min() >= 0 and df[col].max() <= np.iinfo(np.uint16).max)
+            df[col] = df[col].astype('uint16' if fits else 'uint32')
+    return df
+
+
+# Fungsi untuk menghitung satu kolom kalender turunan dari 'date' (tipe sama dengan skema bertipe)
+def calendar_column(df, col):
+    dates = pd.DatetimeIndex(df['date'])
+    if col == 'year':
+        return pd.Series(dates.year.astype('int16'), index=df.index).astype('category')
+    if col == 'month':
+        return pd.Series(pd.Categorical.from_codes(dates.month - 1, dtype=CATEGORICAL_DTYPES['month']), index=df.index)
+    if col == 'month_num':
+        return pd.Series(dates.month.astype('int8'), index=df.index)
+    if col == 'weekday':
+        return pd.Series(pd.Categorical.from_codes(dates.weekday, dtype=CATEGORICAL_DTYPES['weekday']), index=df.index)
+    if col == 'workingday':
+        working = (dates.weekday < 5) & (df['holiday'].astype(int).to_numpy() == 0)
+        return pd.Series(pd.Categorical.from_codes(working.astype(np.int8), dtype=CATEGORICAL_DTYPES['workingday']), index=df.index)
+    raise KeyError(col)
+
+
+# Fungsi untuk menambahkan kolom kalender turunan yang diminta tetapi belum ada (tanpa salinan
+# jika semua kolom sudah ada, mis. pada skema bertipe biasa)
+def with_calendar(df, columns):
+    missing = [col for col in columns if col in DERIVED_CALENDAR_COLUMNS and col not in df.columns]
+    if not missing:
+        return df
+    return df.assign(**{col: calendar_column(df, col) for col in missing})
+
+
+# Fungsi untuk membandingkan memori per baris (termasuk isi string) tiap tata letak tabel:
+# CSV dibaca pandas tanpa tipe, skema bertipe, dan skema ringkas
+def memory_report(tables=TABLES, store_dir=STORE_DIR):
+    rows = []
+    for table in tables:
+        typed = load_table(table, store_dir)
+        layouts = [('pandas-default', pd.read_csv(local_csv_path(table))), ('bertipe', typed), ('ringkas', compact_schema(typed))]
+        for layout, df in layouts:
+            total = int(df.memory_usage(deep=True, index=False).sum())
+            rows.append({'table': table, 'layout': layout, 'rows': len(df), 'columns': df.shape[1],
+                         'bytes': total, 'bytes_per_row': total / max(len(df), 1)})
+    return rows
+
+
+# --- Penyimpanan Kolumnar ---
+def store_path(table, fmt, store_dir=STORE_DIR):
+    if fmt == 'npy':
+        return os.path.join(store_dir, table)
+    return os.path.join(store_dir, f"{table}.{fmt}")
+
+
+# Fungsi untuk menulis tabel kolom-NumPy: satu file .npy per kolom + meta.json untuk kategori
+def _write_npy(df, path):
+    os.makedirs(path, exist_ok=True)
+    meta = {'columns': [], 'categories': {}}
+    for col in df.columns:
+        values = df[col]
+        if isinstance(values.dtype, CategoricalDtype):
+            meta['categories'][col] = [
+                c.item() if hasattr(c, 'item') else c for c in values.cat.categories
+            ]
+            values = values.cat.codes
+        np.save(os.path.join(path, f"{col}.npy"), values.to_numpy())
+        meta['columns'].append(col)
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump(meta, f)
+
+
+def _read_npy(path, mmap=True):
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    data = {}
+    for col in meta['columns']:
+        values = np.load(os.path.join(path, f"{col}.npy"), mmap_mode='r' if mmap else None)
+        if col in meta['categories']:
+            data[col] = pd.Categorical.from_codes(values, categories=meta['categories'][col])
+        else:
+            data[col] = values
+    return pd.DataFrame(data)
+
+
+def default_format():
+    return 'parquet' if HAS_PYARROW else 'npy'
+
+
+# Store parquet/feather yang ditambah (append_store) terdiri dari file dasar dan file bagian
+# '<tabel>.part-00001.<format>' berisi baris baru; store npy (direktori) selalu satu berkas per kolom
+def store_files(path):
+    if os.path.isdir(path):
+        return sorted(os.path.join(path, name) for name in os.listdir(path))
+    root, ext = os.path.splitext(path)
+    return [path] + sorted(glob.glob(f"{glob.escape(root)}.part-*{ext}"))
+
+
+# Waktu ubah terakhir store (file paling baru), None jika store tidak ada
+def store_mtime(path):
+    files = [f for f in store_files(path) if os.path.exists(f)]
+    return max(os.path.getmtime(f) for f in files) if files else None
+
+
+# Store dianggap basi jika CSV lokal lebih baru (mis. etl.py dijalankan tanpa memperbarui store)
+def store_is_stale(table, fmt, store_dir=STORE_DIR):
+    csv_path = local_csv_path(table)
+    mtime = store_mtime(store_path(table, fmt, store_dir))
+    return mtime is not None and os.path.exists(csv_path) and os.path.getmtime(csv_path) > mtime
+
+
+# Fungsi untuk menulis dataframe bertipe ke store kolumnar (menimpa store lama beserta file bagiannya)
+def write_store(df, table, fmt=None, store_dir=STORE_DIR):
+    fmt = fmt or default_format()
+    if fmt in ('parquet', 'feather') and not HAS_PYARROW:
+        raise ImportError(f"Format '{fmt}' membutuhkan pyarrow; gunakan format 'npy'.")
+    os.makedirs(store_dir, exist_ok=True)
+    path = store_path(table, fmt, store_dir)
+    if fmt != 'npy':
+        for part in store_files(path)[1:]:
+            os.remove(part)
+    df = apply_schema(df).reset_index(drop=True)
+    if fmt == 'parquet':
+        df.to_parquet(path, index=False)
+    elif fmt == 'feather':
+        df.to_feather(path)
+    elif fmt == 'npy':
+        _write_npy(df, path)
+    else:
+        raise ValueError(f"Format tidak dikenal: {fmt}")
+    return path
+
+
+# Fungsi untuk menambahkan baris di akhir satu kolom .npy 1-D tanpa menyalin isi lama: data baru
+# ditulis di akhir file lalu header (yang memuat shape) ditulis ulang di tempat. Jika panjang header
+# berubah (jarang, header diberi padding), kolom ditulis ulang utuh.
+def _append_npy_column(path, values):
+    fmt = np.lib.format
+    with open(path, 'r+b') as f:
+        version = fmt.read_magic(f)
+        read_header, write_header = ((fmt.read_array_header_1_0, fmt.write_array_header_1_0) if version == (1, 0)
+                                     else (fmt.read_array_header_2_0, fmt.write_array_header_2_0))
+        shape, fortran_order, dtype = read_header(f)
+        data_offset = f.tell()
+        values = np.ascontiguousarray(values, dtype=dtype)
+        header = io.BytesIO()
+        write_header(header, {'descr': fmt.dtype_to_descr(dtype), 'fortran_order': fortran_order,
+                              'shape': (shape[0] + len(values),)})
+        if header.tell() == data_offset:
+            f.seek(0, os.SEEK_END)
+            f.write(values.tobytes())
+            f.seek(0)
+            f.write(header.getvalue())
+            return
+    np.save(path, np.concatenate([np.load(path), values]))
+
+
+# Fungsi untuk menambahkan baris ke store kolom-NumPy. Kategori baru (mis. tahun baru) ditambahkan
+# di akhir daftar kategori di meta.json sehingga kode kategori lama tetap berlaku.
+def _append_npy(df, path):
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    for col in meta['columns']:
+        values = df[col]
+        if col in meta['categories']:
+            categories = meta['categories'][col]
+            new = [c.item() if hasattr(c, 'item') else c for c in pd.unique(values.astype(object)) if c not in categories]
+            categories.extend(new)
+            values = pd.Categorical(values.astype(object), categories=categories).codes
+        _append_npy_column(os.path.join(path, f"{col}.npy"), np.asarray(values))
+    temp_path = os.path.join(path, "meta.json.tmp")
+    with open(temp_path, "w") as f:
+        json.dump(meta, f)
+    os.replace(temp_path, os.path.join(path, "meta.json"))
+
+
+# Fungsi untuk menambahkan baris baru ke store yang sudah ada tanpa menulis ulang baris lama:
+# npy diperpanjang per kolom, parquet/feather mendapat satu file bagian baru. Tanpa store, ditulis baru.
+def append_store(df, table, fmt=None, store_dir=STORE_DIR):
+    fmt = fmt or find_store(table, store_dir)
+    path = store_path(table, fmt, store_dir) if fmt else None
+    if path is None or not os.path.exists(path):
+        return write_store(df, table, fmt, store_dir)
+    df = apply_schema(df).reset_index(drop=True)
+    if fmt == 'npy':
+        _append_npy(df, path)
+        return path
+    root, ext = os.path.splitext(path)
+    part_path = f"{root}.part-{len(store_files(path)):05d}{ext}"
+    # Tahun ditulis sebagai integer karena kategorinya berbeda per bagian; read_store menyatukannya lagi
+    if 'year' in df.columns:
+        df['year'] = df['year'].astype('int16')
+    temp_path = f"{part_path}.tmp"
+    if fmt == 'parquet':
+        df.to_parquet(temp_path, index=False)
+    else:
+        df.to_feather(temp_path)
+    os.replace(temp_path, part_path)
+    return part_path
+
+
+# Penulis store kolumnar per chunk dengan memori terbatas: parquet per row group, feather sebagai
+# batch Arrow IPC, dan npy ke file memory-map yang dialokasikan di awal (butuh total_rows).
+# Tahun ditulis sebagai int16 biasa karena kategorinya bergantung pada data; read_store mengembalikannya ke kategori.
+class StoreWriter:
+    def __init__(self, table, fmt=None, store_dir=STORE_DIR, total_rows=None):
+        self.fmt = fmt or default_format()
+        if self.fmt in ('parquet', 'feather') and not HAS_PYARROW:
+            raise ImportError(f"Format '{self.fmt}' membutuhkan pyarrow; gunakan format 'npy'.")
+        if self.fmt == 'npy' and total_rows is None:
+            raise ValueError("Format 'npy' membutuhkan total_rows untuk mengalokasikan file di awal.")
+        if self.fmt not in FORMATS:
+            raise ValueError(f"Format tidak dikenal: {self.fmt}")
+        os.makedirs(store_dir, exist_ok=True)
+        self.path = store_path(table, self.fmt, store_dir)
+        self.total_rows = total_rows
+        self.rows = 0
+        self._writer = None
+        self._columns = None
+        self._meta = None
+
+    def _prepare(self, df):
+        df = apply_schema(df).reset_index(drop=True)
+        if 'year' in df.columns:
+            df['year'] = df['year'].astype('int16')
+        return df
+
+    def write(self, df):
+        df = self._prepare(df)
+        if self.fmt == 'npy':
+            self._write_npy_chunk(df)
+        else:
+            import pyarrow as pa
+            batch = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                if self.fmt == 'parquet':
+                    import pyarrow.parquet as pq
+                    self._writer = pq.ParquetWriter(self.path, batch.schema)
+                else:
+                    self._writer = pa.ipc.new_file(self.path, batch.schema)
+            self._writer.write_table(batch)
+        self.rows += len(df)
+
+    def _write_npy_chunk(self, df):
+        if self._columns is None:
+            os.makedirs(self.path, exist_ok=True)
+            self._meta = {'columns': list(df.columns), 'categories': {}}
+            self._columns = {}
+            for col in df.columns:
+                values = df[col]
+                if isinstance(values.dtype, CategoricalDtype):
+                    self._meta['categories'][col] = [
+                        c.item() if hasattr(c, 'item') else c for c in values.cat.categories
+                    ]
+                    values = values.cat.codes
+                self._columns[col] = np.lib.format.open_memmap(
+                    os.path.join(self.path, f"{col}.npy"), mode='w+',
+                    dtype=values.to_numpy().dtype, shape=(self.total_rows,))
+        for col, out in self._columns.items():
+            values = df[col]
+            if isinstance(values.dtype, CategoricalDtype):
+                values = values.cat.codes
+            out[self.rows:self.rows + len(df)] = values.to_numpy()
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._columns is not None:
+            for out in self._columns.values():
+                out.flush()
+            self._columns = None
+            with open(os.path.join(self.path, "meta.json"), "w") as f:
+                json.dump(self._meta, f)
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Fungsi untuk mencari format store yang tersedia untuk sebuah tabel
+def find_store(table, store_dir=STORE_DIR):
+    for fmt in FORMATS:
+        if fmt in ('parquet', 'feather') and not HAS_PYARROW:
+            continue
+        if os.path.exists(store_path(table, fmt, store_dir)):
+            return fmt
+    return None
+
+
+def read_store(table, fmt=None, store_dir=STORE_DIR):
+    fmt = fmt or find_store(table, store_dir)
+    if fmt is None:
+        raise FileNotFoundError(f"Store untuk tabel '{table}' tidak ditemukan di {store_dir}")
+    path = store_path(table, fmt, store_dir)
+    if fmt == 'npy':
+        return apply_schema(_read_npy(path))
+    reader = pd.read_parquet if fmt == 'parquet' else pd.read_feather
+    parts = [reader(part) for part in store_files(path)]
+    if len(parts) > 1:
+        # Kategori tahun berbeda per bagian; disatukan sebagai integer lalu dijadikan kategori lagi oleh apply_schema
+        parts = [part.assign(year=part['year'].astype('int16')) if 'year' in part.columns else part for part in parts]
+    return apply_schema(pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0])
+
+
+# Fungsi utama pemuatan tabel: store kolumnar -> CSV lokal -> CSV via HTTP (cadangan terakhir).
+# Store yang lebih lama dari CSV lokal tidak dipakai (dengan peringatan) agar data baru tidak tertutup store basi.
+# (compact=True mengembalikan skema ringkas, lihat compact_schema)
+def load_table(table, store_dir=STORE_DIR, compact=False):
+    fmt = find_store(table, store_dir)
+    if fmt is not None and store_is_stale(table, fmt, store_dir):
+        warnings.warn(f"Store '{store_path(table, fmt, store_dir)}' lebih lama dari {local_csv_path(table)}; "
+                      f"CSV dipakai. Perbarui store dengan: python data_store.py --format {fmt}")
+        fmt = None
+    if fmt is not None:
+        df = read_store(table, fmt, store_dir)
+    elif os.path.exists(local_csv_path(table)):
+        df = read_csv_typed(local_csv_path(table))
+    else:
+        df = read_csv_typed(REMOTE_CSV_URL.format(table=table))
+    return compact_schema(df) if compact else df
+
+
+def load_tables(store_dir=STORE_DIR):
+    return tuple(load_table(table, store_dir) for table in TABLES)
+
+
+# Konversi satu kali dari CSV dashboard ke store kolumnar
+def convert_csv_to_store(fmt=None, store_dir=STORE_DIR):
+    paths = []
+    for table in TABLES:
+        df = read_csv_typed(local_csv_path(table))
+        paths.append(write_store(df, table, fmt, store_dir))
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Konversi CSV dashboard ke store kolumnar lokal.")
+    parser.add_argument("--format", choices=FORMATS, default=None,
+                        help="Format store (default: parquet jika pyarrow tersedia, selain itu npy)")
+    parser.add_argument("--store-dir", default=STORE_DIR)
+    args = parser.parse_args(argv)
+    for path in convert_csv_to_store(args.format, args.store_dir):
+        print(f"Ditulis: {path}")
+
+
+if __name__ == "__main__":
+    main()
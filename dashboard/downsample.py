@@ -0,0 +1,112 @@
+import os
+
+import numpy as np
+
+# Batas jumlah titik sebelum grafik beralih ke mode aproksimasi; bisa diatur lewat environment
+# variable DASHBOARD_MAX_POINTS (scatter: total titik, garis: titik per seri)
+DEFAULT_MAX_POINTS = 5000
+# Metode downsampling grafik garis: 'lttb' (Largest-Triangle-Three-Buckets) atau 'minmax'
+DEFAULT_LINE_METHOD = 'lttb'
+DENSITY_BINS = 60
+
+LINE_METHOD_NAMES = {'lttb': 'LTTB', 'minmax': 'min-max per bucket'}
+
+
+def max_points_from_env():
+    return int(os.environ.get('DASHBOARD_MAX_POINTS', DEFAULT_MAX_POINTS))
+
+
+def line_method_from_env():
+    return os.environ.get('DASHBOARD_LINE_DOWNSAMPLING', DEFAULT_LINE_METHOD)
+
+
+# Fungsi untuk memilih indeks titik dengan LTTB: titik pertama dan terakhir dipertahankan, sisanya
+# dibagi ke n_out - 2 bucket dan dari tiap bucket dipilih titik yang membentuk segitiga terbesar
+# dengan titik terpilih sebelumnya dan rata-rata bucket berikutnya (rata-rata bucket dihitung sekaligus dari cumsum)
+def lttb_indices(x, y, n_out):
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    bounds = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    cx = np.concatenate([[0.0], np.cumsum(x)])
+    cy = np.concatenate([[0.0], np.cumsum(y)])
+    sizes = bounds[1:] - bounds[:-1]
+    mean_x = np.append((cx[bounds[1:]] - cx[bounds[:-1]]) / sizes, x[-1])
+    mean_y = np.append((cy[bounds[1:]] - cy[bounds[:-1]]) / sizes, y[-1])
+
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = bounds[b], bounds[b + 1]
+        area = np.abs((x[a] - mean_x[b + 1]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (mean_y[b + 1] - y[a]))
+        a = lo + int(area.argmax())
+        selected[b + 1] = a
+    return selected
+
+
+# Fungsi untuk memilih indeks titik minimum dan maksimum di setiap bucket (sepenuhnya vektor NumPy)
+def minmax_indices(y, n_out):
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+    buckets = np.arange(n) * ((n_out - 2) // 2) // n
+    starts = np.flatnonzero(np.diff(buckets, prepend=-1))
+    sizes = np.diff(np.append(starts, n))
+    picked = [[0, n - 1]]
+    for reduce in (np.minimum, np.maximum):
+        extremes = np.flatnonzero(y == np.repeat(reduce.reduceat(y, starts), sizes))
+        # Jika ada nilai kembar, ambil kemunculan pertama di setiap bucket
+        picked.append(extremes[np.unique(buckets[extremes], return_index=True)[1]])
+    return np.unique(np.concatenate(picked))
+
+
+def downsample_indices(x, y, n_out, method=DEFAULT_LINE_METHOD):
+    if method == 'minmax':
+        return minmax_indices(y, n_out)
+    return lttb_indices(x, y, n_out)
+
+
+# Fungsi untuk mengecilkan data grafik garis (terurut menurut sumbu x) per seri/grup.
+# Beberapa kolom y berbagi sumbu x, jadi indeks terpilih dari setiap kolom digabung; batas titik
+# dibagi rata antar kolom agar gabungannya tetap paling banyak max_points titik per grup.
+# Keterangan aproksimasi disimpan di df.attrs['approximation'] agar bisa ditampilkan di halaman.
+def downsample_lines(df, y_columns, group=None, max_points=None, method=None):
+    max_points = max_points or max_points_from_env()
+    method = method or line_method_from_env()
+    if group is None:
+        groups = [np.arange(len(df))]
+    else:
+        codes = df.groupby(group, observed=True, sort=False).ngroup().to_numpy()
+        groups = [np.flatnonzero(codes == code) for code in np.unique(codes)]
+    if all(len(rows) <= max_points for rows in groups):
+        return df
+
+    keep = []
+    for rows in groups:
+        if len(rows) <= max_points:
+            keep.append(rows)
+            continue
+        # Seri dianggap berjarak sama pada sumbu x (jam, hari, bulan), jadi posisi dipakai sebagai x
+        positions = np.arange(len(rows))
+        budget = max(max_points // len(y_columns), 4)
+        picked = [downsample_indices(positions, df[col].to_numpy()[rows], budget, method) for col in y_columns]
+        keep.append(rows[np.unique(np.concatenate(picked))])
+    points_per_series = max(len(rows) for rows in keep)
+    keep = np.sort(np.concatenate(keep))
+    sampled = df.iloc[keep].copy()
+    sampled.attrs['approximation'] = (
+        f"Grafik garis di-downsample dengan {LINE_METHOD_NAMES.get(method, method)}: "
+        f"{len(sampled):,} dari {len(df):,} titik ditampilkan, paling banyak {points_per_series:,} titik "
+        f"per seri (batas {max_points:,} titik per seri)."
+    )
+    return sampled
+
+
+# Fungsi untuk menghitung histogram 2-D (density) sebagai pengganti scatter dengan terlalu banyak titik
+def density_grid(x, y, bins=DENSITY_BINS):
+    counts, x_edges, y_edges = np.histogram2d(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64), bins=bins)
+    return {'counts': counts, 'x_edges': x_edges, 'y_edges': y_edges}
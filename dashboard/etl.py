@@ -0,0 +1,156 @@
+import os
+import argparse
+
+import pandas as pd
+
+import data_store
+
+# --- Lokasi Data Mentah ---
+RAW_DATA_DIR = os.path.join(os.path.dirname(data_store.DASHBOARD_DIR), "data")
+DEFAULT_CHUNKSIZE = 100_000
+
+# Urutan kolom file dashboard_main_data_*.csv (sama dengan hasil notebook)
+DAY_COLUMNS = ['date', 'season', 'year', 'month', 'holiday', 'weekday', 'workingday', 'weather_condition',
+               'temperature', 'feeling_temperature', 'humidity', 'windspeed', 'casual', 'registered',
+               'total_rentals', 'month_num']
+HOUR_COLUMNS = DAY_COLUMNS[:4] + ['hour'] + DAY_COLUMNS[4:]
+OUTPUT_COLUMNS = {'day': DAY_COLUMNS, 'hour': HOUR_COLUMNS}
+
+# Tipe kolom file mentah UCI; kolom kode dibaca sebagai integer kecil
+RAW_DTYPES = {
+    'instant': 'int64', 'season': 'int8', 'yr': 'int8', 'mnth': 'int8', 'hr': 'int8',
+    'holiday': 'int8', 'weekday': 'int8', 'workingday': 'int8', 'weathersit': 'int8',
+    'temp': 'float64', 'atemp': 'float64', 'hum': 'float64', 'windspeed': 'float64',
+    'casual': 'int64', 'registered': 'int64', 'cnt': 'int64',
+}
+
+
+def raw_csv_path(table):
+    return os.path.join(RAW_DATA_DIR, f"{table}.csv")
+
+
+# Fungsi untuk mengubah satu chunk data mentah ke format dashboard.
+# Semua pemetaan label memakai lookup kode kategori (Categorical.from_codes), bukan apply/map per baris.
+def transform_chunk(raw, table):
+    df = pd.DataFrame({'date': pd.to_datetime(raw['dteday'])})
+    # 1: Spring, 2: Summer, 3: Fall, 4: Winter
+    df['season'] = pd.Categorical.from_codes(raw['season'].to_numpy() - 1, dtype=data_store.CATEGORICAL_DTYPES['season'])
+    # Tahun diambil dari tanggal (setara dengan 0: 2011, 1: 2012, dan tetap benar untuk tahun berikutnya)
+    df['year'] = df['date'].dt.year
+    df['month'] = pd.Categorical.from_codes(raw['mnth'].to_numpy() - 1, dtype=data_store.CATEGORICAL_DTYPES['month'])
+    if table == 'hour':
+        df['hour'] = raw['hr'].to_numpy()
+    df['holiday'] = raw['holiday'].to_numpy()
+    # Data mentah: 0 = Sunday, ..., 6 = Saturday; kategori dashboard dimulai dari Monday
+    df['weekday'] = pd.Categorical.from_codes((raw['weekday'].to_numpy() + 6) % 7, dtype=data_store.CATEGORICAL_DTYPES['weekday'])
+    # 0: Non-Working Day, 1: Working Day
+    df['workingday'] = pd.Categorical.from_codes(raw['workingday'].to_numpy(), dtype=data_store.CATEGORICAL_DTYPES['workingday'])
+    df['weather_condition'] = pd.Categorical.from_codes(raw['weathersit'].to_numpy() - 1, dtype=data_store.CATEGORICAL_DTYPES['weather_condition'])
+    df['temperature'] = raw['temp'].to_numpy()
+    df['feeling_temperature'] = raw['atemp'].to_numpy()
+    df['humidity'] = raw['hum'].to_numpy()
+    df['windspeed'] = raw['windspeed'].to_numpy()
+    df['casual'] = raw['casual'].to_numpy()
+    df['registered'] = raw['registered'].to_numpy()
+    df['total_rentals'] = raw['cnt'].to_numpy()
+    df['month_num'] = raw['mnth'].to_numpy()
+    return df[OUTPUT_COLUMNS[table]]
+
+
+# Fungsi untuk membaca kunci (tanggal[, jam]) baris terakhir file output tanpa membaca seluruh file
+def last_output_key(path, table):
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    with open(path, 'rb') as f:
+        header = f.readline().decode().strip().split(',')
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        block = b''
+        # Baca mundur per blok sampai menemukan baris terakhir yang utuh
+        while position > 0 and block.count(b'\n') < 2:
+            step = min(4096, position)
+            position -= step
+            f.seek(position)
+            block = f.read(step) + block
+    last_line = block.strip().split(b'\n')[-1].decode().split(',')
+    if last_line == header:
+        return None
+    values = dict(zip(header, last_line))
+    key = (pd.Timestamp(values['date']),)
+    if table == 'hour':
+        key += (int(values['hour']),)
+    return key
+
+
+# Fungsi untuk membuang baris yang sudah ada di output (mode append inkremental)
+def rows_after(raw, table, last_key):
+    dates = pd.to_datetime(raw['dteday'])
+    if table == 'hour':
+        newer = (dates > last_key[0]) | ((dates == last_key[0]) & (raw['hr'] > last_key[1]))
+    else:
+        newer = dates > last_key[0]
+    return raw[newer.to_numpy()]
+
+
+# Fungsi ETL utama: membaca file mentah per chunk lalu menulis langsung ke CSV dashboard.
+# Dengan append=True, hanya baris setelah baris terakhir output yang diproses dan ditambahkan.
+# on_chunk (opsional) dipanggil dengan setiap chunk yang ditulis (mis. untuk memperbarui store).
+def run_etl(table, input_path=None, output_path=None, chunksize=DEFAULT_CHUNKSIZE, append=False, on_chunk=None):
+    input_path = input_path or raw_csv_path(table)
+    output_path = output_path or data_store.local_csv_path(table)
+    append = append and os.path.exists(output_path) and os.path.getsize(output_path) > 0
+    last_key = last_output_key(output_path, table) if append else None
+    write_header = not append
+
+    rows_written = 0
+    dtype = {col: t for col, t in RAW_DTYPES.items() if table == 'hour' or col != 'hr'}
+    with open(output_path, 'a' if append else 'w', newline='') as out:
+        for raw in pd.read_csv(input_path, dtype=dtype, chunksize=chunksize):
+            if last_key is not None:
+                raw = rows_after(raw, table, last_key)
+                if raw.empty:
+                    continue
+            chunk = transform_chunk(raw, table)
+            chunk.to_csv(out, index=False, header=write_header, date_format='%Y-%m-%d')
+            if on_chunk is not None:
+                on_chunk(chunk)
+            write_header = False
+            rows_written += len(chunk)
+    return rows_written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ETL data mentah bike sharing (data/*.csv) ke format CSV dashboard.")
+    parser.add_argument("--tables", nargs='+', choices=data_store.TABLES, default=data_store.TABLES)
+    parser.add_argument("--day-input", default=None, help="Path day.csv mentah (default: data/day.csv)")
+    parser.add_argument("--hour-input", default=None, help="Path hour.csv mentah (default: data/hour.csv)")
+    parser.add_argument("--output-dir", default=data_store.DASHBOARD_DIR)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--append", action="store_true",
+                        help="Hanya tambahkan baris yang lebih baru dari baris terakhir di output")
+    parser.add_argument("--store", action="store_true",
+                        help="Buat/perbarui store kolumnar (lihat data_store.py) setelah ETL selesai; "
+                             "store yang sudah ada untuk CSV dashboard selalu diperbarui")
+    args = parser.parse_args(argv)
+
+    inputs = {'day': args.day_input, 'hour': args.hour_input}
+    for table in args.tables:
+        output_path = os.path.join(args.output_dir, f"dashboard_main_data_{table}.csv")
+        # Store yang sudah ada selalu ikut diperbarui agar dashboard tidak memuat data lama dari store
+        store_fmt = None
+        if os.path.abspath(output_path) == os.path.abspath(data_store.local_csv_path(table)):
+            store_fmt = data_store.find_store(table)
+        # Mode append: hanya baris baru yang ditambahkan ke store, kecuali store sudah tertinggal dari CSV
+        new_chunks = [] if args.append and store_fmt and not data_store.store_is_stale(table, store_fmt) else None
+        rows = run_etl(table, inputs[table], output_path, args.chunksize, args.append,
+                       on_chunk=new_chunks.append if new_chunks is not None else None)
+        print(f"{table}: {rows} baris ditulis ke {output_path}")
+        if new_chunks is not None:
+            if new_chunks:
+                print(f"Ditambahkan: {data_store.append_store(pd.concat(new_chunks, ignore_index=True), table, store_fmt)}")
+        elif args.store or store_fmt:
+            print(f"Ditulis: {data_store.write_store(data_store.read_csv_typed(output_path), table, store_fmt)}")
+
+
+if __name__ == "__main__":
+    main()
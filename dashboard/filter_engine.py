@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+
+# Kolom kategorikal yang dipakai filter sidebar dan memiliki bitmap per kategori
+BITMAP_COLUMNS = ['season', 'weather_condition']
+
+
+# Fungsi untuk menambahkan nilai ke buffer NumPy yang tumbuh dua kali lipat (append amortized O(1))
+def append_to_buffer(buffer, n, values):
+    needed = n + len(values)
+    if needed > len(buffer):
+        grown = np.zeros(max(needed, 2 * len(buffer)), dtype=buffer.dtype)
+        grown[:n] = buffer[:n]
+        buffer = grown
+    buffer[n:needed] = values
+    return buffer
+
+
+# Fungsi untuk menambahkan bit ke bitmap packbits yang berisi n bit; byte terakhir yang
+# belum penuh digabung dengan bit baru sehingga biayanya hanya sebanding dengan bit baru
+def append_bits(bitmap, n, bits):
+    start = n // 8
+    offset = n % 8
+    if offset:
+        head = np.unpackbits(bitmap[start:start + 1])[:offset].astype(bool)
+        bits = np.concatenate([head, bits])
+    packed = np.packbits(bits)
+    needed = start + len(packed)
+    if needed > len(bitmap):
+        grown = np.zeros(max(needed, 2 * len(bitmap)), dtype=np.uint8)
+        grown[:start] = bitmap[:start]
+        bitmap = grown
+    bitmap[start:needed] = packed
+    return bitmap
+
+
+def _category_codes(values):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), list(values.cat.categories)
+    codes, categories = pd.factorize(values)
+    return codes, list(categories)
+
+
+# Mesin filter: frame diurutkan berdasarkan tanggal satu kali, rentang tanggal dicari dengan
+# binary search (searchsorted), dan filter musim/cuaca memakai bitmap per kategori (packbits)
+# sehingga hasil filter berupa slice + AND bitmap tanpa menyalin frame asli.
+class FilterEngine:
+    def __init__(self, df, bitmap_columns=BITMAP_COLUMNS):
+        dates = df['date'].to_numpy()
+        if len(dates) > 1 and not (dates[1:] >= dates[:-1]).all():
+            df = df.iloc[np.argsort(dates, kind='stable')]
+            dates = df['date'].to_numpy()
+        self._frames = [df.reset_index(drop=True)]
+        self._n = len(dates)
+        self._dates = dates.copy()
+        self._bitmap_columns = [col for col in bitmap_columns if col in df.columns]
+        self._category_order = {}
+        self._bitmaps = {}
+        for col in self._bitmap_columns:
+            codes, categories = _category_codes(df[col])
+            self._category_order[col] = categories
+            self._bitmaps[col] = {
+                category: np.packbits(codes == code)
+                for code, category in enumerate(categories)
+                if (codes == code).any()
+            }
+
+    def __len__(self):
+        return self._n
+
+    # Frame hasil append digabung secara malas, hanya saat baris mentah benar-benar dibutuhkan
+    @property
+    def df(self):
+        if len(self._frames) > 1:
+            self._frames = [pd.concat(self._frames, ignore_index=True)]
+        return self._frames[0]
+
+    # Fungsi untuk menambahkan baris baru. Jika tanggalnya tidak lebih awal dari tanggal terakhir,
+    # biayanya sebanding dengan jumlah baris baru; jika tidak, seluruh index dibangun ulang.
+    def append(self, df):
+        if df.empty:
+            return
+        dates = df['date'].to_numpy().astype(self._dates.dtype)
+        if (self._n and dates.min() < self._dates[self._n - 1]) or (len(dates) > 1 and not (dates[1:] >= dates[:-1]).all()):
+            self.__init__(pd.concat([self.df, df], ignore_index=True), self._bitmap_columns)
+            return
+
+        for col in self._bitmap_columns:
+            codes, categories = _category_codes(df[col])
+            for code, category in enumerate(categories):
+                bits = codes == code
+                if category not in self._bitmaps[col]:
+                    if not bits.any():
+                        continue
+                    self._bitmaps[col][category] = np.zeros((self._n + 7) // 8, dtype=np.uint8)
+                    if category not in self._category_order[col]:
+                        self._category_order[col].append(category)
+                self._bitmaps[col][category] = append_bits(self._bitmaps[col][category], self._n, bits)
+            # Kategori yang tidak muncul di batch ini tetap perlu bit 0 untuk baris baru
+            for category, bitmap in self._bitmaps[col].items():
+                if category not in categories:
+                    self._bitmaps[col][category] = append_bits(bitmap, self._n, np.zeros(len(df), dtype=bool))
+
+        self._dates = append_to_buffer(self._dates, self._n, dates)
+        self._n += len(dates)
+        self._frames.append(df.reset_index(drop=True))
+
+    # Kolom tanggal terurut (view, tanpa salinan)
+    @property
+    def dates(self):
+        return self._dates[:self._n]
+
+    # Tanggal pertama dan terakhir di data (untuk batas input tanggal di sidebar)
+    @property
+    def min_date(self):
+        return pd.Timestamp(self._dates[0])
+
+    @property
+    def max_date(self):
+        return pd.Timestamp(self._dates[self._n - 1])
+
+    # Kategori yang benar-benar muncul di data (urutan kategori dipertahankan)
+    def categories(self, col):
+        return [category for category in self._category_order[col] if category in self._bitmaps[col]]
+
+    def _to_datetime64(self, value):
+        return pd.Timestamp(value).to_datetime64().astype(self._dates.dtype)
+
+    # Fungsi untuk mencari batas baris [lo, hi) dari rentang tanggal inklusif
+    def date_slice(self, start_date, end_date):
+        dates = self._dates[:self._n]
+        lo = int(np.searchsorted(dates, self._to_datetime64(start_date), side='left'))
+        hi = int(np.searchsorted(dates, self._to_datetime64(end_date), side='right'))
+        return lo, max(lo, hi)
+
+    # Fungsi untuk menggabungkan (OR) bitmap kategori yang dipilih pada rentang byte [b0, b1)
+    def _category_bits(self, col, selected, b0, b1):
+        bits = np.zeros(b1 - b0, dtype=np.uint8)
+        for category in selected:
+            bitmap = self._bitmaps[col].get(category)
+            if bitmap is not None:
+                bits |= bitmap[b0:b1]
+        return bits
+
+    # Fungsi untuk menghitung posisi baris yang lolos filter (None berarti seluruh slice lolos)
+    def positions(self, start_date, end_date, seasons_filter=None, weather_filter=None):
+        lo, hi = self.date_slice(start_date, end_date)
+        if lo == hi:
+            return lo, hi, np.empty(0, dtype=np.intp)
+
+        b0, b1 = lo // 8, (hi + 7) // 8
+        combined = None
+        for col, selected in (('season', seasons_filter), ('weather_condition', weather_filter)):
+            # Filter kosong atau mencakup semua kategori yang ada tidak perlu bitmap
+            if not selected or col not in self._bitmaps or set(self._bitmaps[col]) <= set(selected):
+                continue
+            bits = self._category_bits(col, selected, b0, b1)
+            combined = bits if combined is None else combined & bits
+        if combined is None:
+            return lo, hi, None
+
+        mask = np.unpackbits(combined)[lo - b0 * 8:hi - b0 * 8].view(bool)
+        return lo, hi, np.flatnonzero(mask) + lo
+
+    # Fungsi untuk memfilter data berdasarkan input sidebar
+    def filter(self, start_date, end_date, seasons_filter=None, weather_filter=None):
+        lo, hi, rows = self.positions(start_date, end_date, seasons_filter, weather_filter)
+        if rows is None:
+            return self.df.iloc[lo:hi]
+        return self.df.iloc[rows]
@@ -0,0 +1,220 @@
+import os
+import json
+import warnings
+import threading
+
+import numpy as np
+import pandas as pd
+
+import data_store
+from olap_cube import OlapCube, CUBE_MEASURES, HOUR_CUBE_DIMENSIONS
+
+# duckdb bersifat opsional: tanpa duckdb, backend out-of-core memakai kolom .npy yang di-memory-map
+try:
+    import duckdb
+    HAS_DUCKDB = True
+except ImportError:
+    HAS_DUCKDB = False
+
+# Backend tabel jam-an: 'memory' (cube OLAP di memori), 'duckdb' (query SQL atas parquet/CSV),
+# 'npy' (kolom memory-map dibaca per chunk), atau 'auto' (npy -> duckdb -> memory)
+HOUR_BACKENDS = ['memory', 'duckdb', 'npy', 'auto']
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+
+def backend_from_env():
+    return os.environ.get('DASHBOARD_HOUR_BACKEND', 'memory')
+
+
+# Nama tabel jam-an di store (mis. 'synthetic_hour' hasil synthetic.py)
+def table_from_env():
+    return os.environ.get('DASHBOARD_HOUR_TABLE', 'hour')
+
+
+def _selected(selected, categories):
+    # Filter kosong berarti tidak memfilter (sama seperti FilterEngine)
+    if not selected or set(categories) <= set(selected):
+        return None
+    return [category for category in categories if category in selected]
+
+
+def _is_integer_measure(m):
+    return pd.api.types.is_integer_dtype(data_store.NUMERIC_DTYPES.get(m, 'float64'))
+
+
+# Fungsi untuk menyusun hasil roll-up dengan bentuk yang sama seperti OlapCube.rollup:
+# kolom dimensi kategorikal (urut menurut kode kategori) lalu kolom ukuran
+def _rollup_frame(by, codes, categories, totals, row_counts, measures, how):
+    result = {}
+    for dim in by:
+        result[dim] = pd.Categorical.from_codes(codes[dim], categories=categories[dim])
+    for m in measures:
+        if how == 'mean':
+            result[m] = totals[m] / row_counts
+        elif _is_integer_measure(m):
+            result[m] = np.rint(totals[m]).astype(np.int64)
+        else:
+            result[m] = totals[m]
+    return pd.DataFrame(result, columns=list(by) + list(measures))
+
+
+# Backend DuckDB: filter dan group-by dijalankan sebagai SQL langsung atas file parquet
+# (atau CSV). Pada parquet, predikat tanggal didorong ke statistik min/max row group sehingga
+# row group di luar rentang tidak dibaca; memori puncak sebanding dengan hasil agregasi.
+class DuckDBHourBackend:
+    def __init__(self, path, measures=CUBE_MEASURES):
+        if not HAS_DUCKDB:
+            raise ImportError("Backend 'duckdb' membutuhkan paket duckdb; gunakan backend 'npy'.")
+        self.path = path
+        self.measures = list(measures)
+        self._connection = duckdb.connect()
+        # Store parquet yang ditambah lewat append_store terdiri dari beberapa file bagian
+        files = ', '.join("'" + f.replace("'", "''") + "'" for f in data_store.store_files(path))
+        reader = f"read_parquet([{files}])" if path.endswith('.parquet') else f"read_csv([{files}])"
+        self._connection.execute(f"CREATE VIEW hour AS SELECT * FROM {reader}")
+        self._lock = threading.Lock()
+
+    def _query(self, sql, params):
+        # Satu koneksi dipakai bersama antar sesi Streamlit, jadi query dijalankan bergantian
+        with self._lock:
+            return self._connection.execute(sql, params).df()
+
+    def __len__(self):
+        return int(self._query("SELECT COUNT(*) AS n FROM hour", [])['n'].iloc[0])
+
+    def rollup(self, by, start_date, end_date, seasons_filter=None, weather_filter=None,
+               measures=None, how='sum'):
+        measures = measures or self.measures
+        by = list(by)
+        categories = {dim: list(data_store.CATEGORICAL_DTYPES[dim].categories) for dim in by}
+        where = ["date BETWEEN ? AND ?"]
+        params = [pd.Timestamp(start_date).to_pydatetime(), pd.Timestamp(end_date).to_pydatetime()]
+        for col, selected in (('season', seasons_filter), ('weather_condition', weather_filter)):
+            selected = _selected(selected, data_store.CATEGORICAL_DTYPES[col].categories)
+            if selected is not None:
+                where.append(f"{col} IN ({', '.join('?' for _ in selected)})")
+                params += list(selected)
+        aggregates = ', '.join(f"CAST(SUM({m}) AS DOUBLE) AS {m}" for m in measures)
+        sql = f"SELECT {''.join(f'{dim}, ' for dim in by)}{aggregates}, COUNT(*) AS row_count FROM hour WHERE {' AND '.join(where)}"
+        if by:
+            sql += f" GROUP BY {', '.join(by)}"
+        sql += " HAVING COUNT(*) > 0"
+        grouped = self._query(sql, params)
+
+        codes = {dim: pd.Categorical(grouped[dim], categories=categories[dim]).codes for dim in by}
+        order = np.lexsort([codes[dim] for dim in reversed(by)]) if by else np.arange(len(grouped))
+        row_counts = grouped['row_count'].to_numpy(dtype=np.float64)[order]
+        totals = {m: grouped[m].to_numpy(dtype=np.float64)[order] for m in measures}
+        return _rollup_frame(by, {dim: codes[dim][order] for dim in by}, categories, totals, row_counts, measures, how)
+
+
+# Backend kolom NumPy (store format npy, terurut per tanggal): rentang tanggal dicari dengan binary
+# search atas file yang di-memory-map (hanya menyentuh beberapa halaman), lalu baris dalam rentang
+# dibaca per chunk (np.fromfile) dan diagregasi dengan np.bincount. Chunk tidak dibaca lewat
+# memory-map agar halaman file yang sudah diproses tidak menumpuk di memori proses, sehingga
+# memori puncak dibatasi ukuran chunk, bukan ukuran tabel.
+class MemmapHourBackend:
+    def __init__(self, path, measures=CUBE_MEASURES, chunk_rows=DEFAULT_CHUNK_ROWS):
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        self.path = path
+        self.measures = list(measures)
+        self.chunk_rows = chunk_rows
+        self._categories = meta['categories']
+        self._columns = {
+            col: np.load(os.path.join(path, f"{col}.npy"), mmap_mode='r')
+            for col in meta['columns']
+            if col in ['date', 'season', 'weather_condition'] + HOUR_CUBE_DIMENSIONS + self.measures
+        }
+        self._dates = self._columns['date']
+        # Binary search membutuhkan tanggal terurut; dicek sekali per chunk saat dibuka
+        for lo in range(0, len(self._dates), chunk_rows):
+            block = self._chunk('date', max(lo - 1, 0), min(lo + chunk_rows, len(self._dates)))
+            if not (block[1:] >= block[:-1]).all():
+                raise ValueError(f"Kolom tanggal di {path} harus terurut untuk backend 'npy'.")
+
+    # Fungsi untuk membaca baris [start, stop) satu kolom langsung dari file .npy
+    def _chunk(self, col, start, stop):
+        column = self._columns[col]
+        return np.fromfile(column.filename, dtype=column.dtype, count=stop - start,
+                           offset=column.offset + start * column.dtype.itemsize)
+
+    def __len__(self):
+        return len(self._dates)
+
+    def _date_slice(self, start_date, end_date):
+        start = pd.Timestamp(start_date).to_datetime64().astype(self._dates.dtype)
+        end = pd.Timestamp(end_date).to_datetime64().astype(self._dates.dtype)
+        lo = int(np.searchsorted(self._dates, start, side='left'))
+        hi = int(np.searchsorted(self._dates, end, side='right'))
+        return lo, max(lo, hi)
+
+    def rollup(self, by, start_date, end_date, seasons_filter=None, weather_filter=None,
+               measures=None, how='sum'):
+        measures = measures or self.measures
+        by = list(by)
+        lo, hi = self._date_slice(start_date, end_date)
+        # Filter musim/cuaca sebagai tabel lookup kode kategori -> lolos/tidak
+        filters = []
+        for col, selected in (('season', seasons_filter), ('weather_condition', weather_filter)):
+            selected = _selected(selected, self._categories[col])
+            if selected is not None:
+                filters.append((col, np.isin(self._categories[col], selected)))
+        shape = tuple(len(self._categories[dim]) for dim in by) or (1,)
+        size = int(np.prod(shape))
+        row_counts = np.zeros(size)
+        totals = {m: np.zeros(size) for m in measures}
+
+        for start in range(lo, hi, self.chunk_rows):
+            stop = min(start + self.chunk_rows, hi)
+            keep = None
+            for col, allowed in filters:
+                passed = allowed[self._chunk(col, start, stop)]
+                keep = passed if keep is None else keep & passed
+            if by:
+                keys = np.ravel_multi_index([self._chunk(dim, start, stop).astype(np.intp) for dim in by], shape)
+            else:
+                keys = np.zeros(stop - start, dtype=np.intp)
+            if keep is not None:
+                keys = keys[keep]
+            row_counts += np.bincount(keys, minlength=size)
+            for m in measures:
+                values = self._chunk(m, start, stop)
+                totals[m] += np.bincount(keys, weights=values[keep] if keep is not None else values, minlength=size)
+
+        present = np.flatnonzero(row_counts > 0)
+        codes = dict(zip(by, np.unravel_index(present, shape)))
+        return _rollup_frame(by, codes, self._categories, {m: totals[m][present] for m in measures},
+                             row_counts[present], measures, how)
+
+
+# Fungsi untuk membuka backend jam-an; semua backend menyediakan rollup() dengan signature
+# yang sama seperti OlapCube.rollup sehingga section dashboard tidak perlu diubah
+def open_hour_backend(kind=None, table=None, store_dir=data_store.STORE_DIR):
+    kind = kind or backend_from_env()
+    table = table or table_from_env()
+    if kind not in HOUR_BACKENDS:
+        raise ValueError(f"Backend jam-an tidak dikenal: {kind}")
+    npy_path = data_store.store_path(table, 'npy', store_dir)
+    parquet_path = data_store.store_path(table, 'parquet', store_dir)
+    csv_path = data_store.local_csv_path(table)
+    npy_stale = data_store.store_is_stale(table, 'npy', store_dir)
+    if kind == 'auto':
+        if os.path.exists(npy_path) and not npy_stale:
+            kind = 'npy'
+        elif HAS_DUCKDB and (os.path.exists(parquet_path) or os.path.exists(csv_path)):
+            kind = 'duckdb'
+        else:
+            kind = 'memory'
+    if kind == 'npy':
+        if npy_stale:
+            warnings.warn(f"Store '{npy_path}' lebih lama dari {csv_path}; perbarui store dengan etl.py atau data_store.py.")
+        return MemmapHourBackend(npy_path)
+    if kind == 'duckdb':
+        # Parquet diutamakan karena mendukung pushdown predikat tanggal; CSV dipindai secara streaming.
+        # Parquet yang lebih lama dari CSV lokal dilewati (sama seperti data_store.load_table)
+        for path in (parquet_path, csv_path):
+            if os.path.exists(path) and not (path == parquet_path and data_store.store_is_stale(table, 'parquet', store_dir)):
+                return DuckDBHourBackend(path)
+        raise FileNotFoundError(f"Parquet/CSV untuk tabel '{table}' tidak ditemukan")
+    return OlapCube(data_store.load_table(table, store_dir, compact=data_store.compact_from_env()), HOUR_CUBE_DIMENSIONS)
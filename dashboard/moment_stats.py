@@ -0,0 +1,119 @@
+import itertools
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from olap_cube import OlapCube, aggregate_cells
+
+# Kolom numerik bagian 6 (heatmap korelasi dan garis regresi cuaca vs total penyewaan)
+MOMENT_COLUMNS = ['temperature', 'feeling_temperature', 'humidity', 'windspeed', 'casual', 'registered', 'total_rentals']
+# Partisi statistik: satu sel per tanggal x musim x cuaca, sehingga filter dashboard cukup menjumlahkan sel
+MOMENT_DIMENSIONS = ['season', 'weather_condition']
+
+# Kuantil t (dua sisi 95%) untuk derajat bebas kecil; di atasnya dipakai ekspansi Cornish-Fisher
+T_975_SMALL_DF = {1: 12.7062, 2: 4.3027, 3: 3.1824, 4: 2.7764}
+
+
+def _product_name(a, b):
+    return f'{a}*{b}'
+
+
+# Fungsi untuk membuat kolom statistik cukup per baris: nilai x dan hasil kali x_i * x_j (i <= j)
+def moment_frame(df, columns=MOMENT_COLUMNS):
+    frame = df[['date'] + MOMENT_DIMENSIONS].copy()
+    frame['n'] = 1.0
+    values = {col: df[col].to_numpy(dtype=np.float64) for col in columns}
+    for col in columns:
+        frame[col] = values[col]
+    for a, b in itertools.combinations_with_replacement(columns, 2):
+        frame[_product_name(a, b)] = values[a] * values[b]
+    return frame
+
+
+# Kuantil distribusi t (Abramowitz & Stegun 26.7.5); cukup akurat untuk pita kepercayaan grafik
+def t_quantile(df, level=0.95):
+    if level == 0.95 and df in T_975_SMALL_DF:
+        return T_975_SMALL_DF[df]
+    z = NormalDist().inv_cdf(0.5 + level / 2)
+    g1 = (z ** 3 + z) / 4
+    g2 = (5 * z ** 5 + 16 * z ** 3 + 3 * z) / 96
+    g3 = (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / 384
+    g4 = (79 * z ** 9 + 776 * z ** 7 + 1482 * z ** 5 - 1920 * z ** 3 - 945 * z) / 92160
+    return z + g1 / df + g2 / df ** 2 + g3 / df ** 3 + g4 / df ** 4
+
+
+# Statistik cukup (count, sum, sum of squares, cross-product) yang dipartisi per hari dalam cube OLAP.
+# Matriks korelasi dan garis OLS untuk filter apa pun dihitung dari jumlah partisi yang lolos
+# filter (O(partisi)), bukan dari baris mentah. Partisi bisa ditambah/dikoreksi secara inkremental.
+class MomentStats:
+    def __init__(self, df, columns=MOMENT_COLUMNS):
+        self.columns = list(columns)
+        self._measures = ['n'] + self.columns + [_product_name(a, b) for a, b in itertools.combinations_with_replacement(self.columns, 2)]
+        self.cube = OlapCube(moment_frame(df, self.columns), MOMENT_DIMENSIONS, self._measures)
+
+    # Fungsi untuk menambahkan baris baru (sign=-1 membatalkan baris lama, mis. hari yang diperbarui)
+    def append(self, df, sign=1):
+        if df.empty:
+            return
+        cells = aggregate_cells(moment_frame(df, self.columns), MOMENT_DIMENSIONS, self._measures)
+        if sign != 1:
+            cells[self._measures + ['row_count']] *= sign
+        self.cube.append_cells(cells)
+
+    # Fungsi untuk menjumlahkan partisi yang lolos filter: (n, vektor jumlah, matriks jumlah hasil kali)
+    def moments(self, start_date, end_date, seasons_filter=None, weather_filter=None):
+        totals = self.cube.rollup([], start_date, end_date, seasons_filter, weather_filter)
+        if totals.empty:
+            return 0.0, np.zeros(len(self.columns)), np.zeros((len(self.columns), len(self.columns)))
+        totals = totals.iloc[0]
+        sums = totals[self.columns].to_numpy(dtype=np.float64)
+        products = np.empty((len(self.columns), len(self.columns)))
+        for (i, a), (j, b) in itertools.combinations_with_replacement(enumerate(self.columns), 2):
+            products[i, j] = products[j, i] = totals[_product_name(a, b)]
+        n = float(totals['n'])
+        return n, sums, products
+
+    # Matriks korelasi Pearson dari statistik cukup (setara DataFrame.corr())
+    def correlation(self, start_date, end_date, seasons_filter=None, weather_filter=None):
+        n, sums, products = self.moments(start_date, end_date, seasons_filter, weather_filter)
+        if n < 2:
+            return None
+        scatter = products - np.outer(sums, sums) / n
+        std = np.sqrt(np.clip(np.diag(scatter), 0, None))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = scatter / np.outer(std, std)
+        np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+        return pd.DataFrame(np.clip(corr, -1, 1), index=self.columns, columns=self.columns)
+
+    # Garis OLS y ~ x dengan pita kepercayaan rata-rata bentuk tertutup (tanpa bootstrap):
+    # y_hat +/- t(n-2) * s * sqrt(1/n + (x0 - x_bar)^2 / Sxx)
+    def regression(self, x, y, start_date, end_date, seasons_filter=None, weather_filter=None,
+                   x_range=None, grid_size=100, level=0.95, moments=None):
+        n, sums, products = moments or self.moments(start_date, end_date, seasons_filter, weather_filter)
+        i, j = self.columns.index(x), self.columns.index(y)
+        if n < 3:
+            return None
+        x_mean, y_mean = sums[i] / n, sums[j] / n
+        s_xx = products[i, i] - sums[i] * sums[i] / n
+        s_xy = products[i, j] - sums[i] * sums[j] / n
+        s_yy = products[j, j] - sums[j] * sums[j] / n
+        if s_xx <= 0:
+            return None
+        slope = s_xy / s_xx
+        intercept = y_mean - slope * x_mean
+        residual_var = max(s_yy - slope * s_xy, 0.0) / (n - 2)
+
+        # Tanpa x_range, rentang x diperkirakan dari mean +/- 2 simpangan baku (min/maks tidak ada di statistik cukup)
+        if x_range is None:
+            x_std = np.sqrt(s_xx / n)
+            x_range = (x_mean - 2 * x_std, x_mean + 2 * x_std)
+        grid = np.linspace(x_range[0], x_range[1], grid_size)
+        fitted = intercept + slope * grid
+        half_width = t_quantile(int(n - 2), level) * np.sqrt(residual_var * (1 / n + (grid - x_mean) ** 2 / s_xx))
+        return {
+            'slope': slope,
+            'intercept': intercept,
+            'n': int(n),
+            'line': pd.DataFrame({x: grid, y: fitted, 'lower': fitted - half_width, 'upper': fitted + half_width}),
+        }
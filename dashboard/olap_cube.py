@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+
+import data_store
+from filter_engine import FilterEngine, append_to_buffer
+
+# Ukuran yang disimpan di cube (jumlah per sel + banyaknya baris mentah per sel)
+CUBE_MEASURES = ['total_rentals', 'casual', 'registered']
+
+# Dimensi turunan yang dihitung dari kolom tanggal (nama dimensi -> unit datetime64)
+DERIVED_DIMENSIONS = {'year': 'Y', 'year_month': 'M'}
+
+
+# Fungsi untuk mengagregasi baris mentah ke sel cube (tanggal x dimensi) dengan ukuran sum + row_count.
+# Dimensi kalender yang tidak disimpan (skema ringkas) diturunkan dari tanggal lebih dulu.
+def aggregate_cells(df, dimensions, measures=CUBE_MEASURES):
+    df = data_store.with_calendar(df, dimensions)
+    grouped = df.groupby(['date'] + list(dimensions), observed=True, sort=True)
+    cells = grouped[measures].sum()
+    cells['row_count'] = grouped.size()
+    return cells.reset_index()
+
+
+def _period_labels(dim, periods):
+    if dim == 'year':
+        return list(periods.astype(int) + 1970)
+    return list(periods.astype(str))
+
+
+# Cube OLAP: data mentah diagregasi sekali pada grain terhalus yang dibutuhkan filter
+# (tanggal x dimensi), menyimpan ukuran sum dan count. Setiap grafik dihitung sebagai roll-up
+# sel cube yang lolos filter (np.bincount atas kode dimensi), bukan scan baris mentah.
+# Sel baru dapat ditambahkan (append) sehingga cube bisa diperbarui secara inkremental.
+class OlapCube:
+    def __init__(self, df, dimensions, measures=CUBE_MEASURES):
+        self.measures = list(measures)
+        self._dimensions = list(dimensions)
+        self._integer = {m: pd.api.types.is_integer_dtype(df[m]) for m in measures}
+        self._categories = {}
+        self._init_cells(aggregate_cells(df, dimensions, measures))
+
+    def _init_cells(self, cells):
+        # Sel cube diurutkan per tanggal; filter tanggal/musim/cuaca memakai mesin yang sama
+        self.engine = FilterEngine(cells[['date'] + [col for col in ('season', 'weather_condition') if col in cells.columns]])
+        order = cells['date'].to_numpy().argsort(kind='stable')
+        cells = cells.iloc[order].reset_index(drop=True)
+        self._n = len(cells)
+        self._counts = cells['row_count'].to_numpy(dtype=np.float64)
+        self._sums = {m: cells[m].to_numpy(dtype=np.float64) for m in self.measures}
+
+        self._codes = {}
+        for dim in self._dimensions:
+            codes, categories = self._dimension_codes(dim, cells[dim])
+            self._codes[dim] = codes
+            self._categories[dim] = categories
+
+        dates = cells['date'].to_numpy()
+        self._periods = {}
+        for dim, unit in DERIVED_DIMENSIONS.items():
+            periods, codes = np.unique(dates.astype(f'datetime64[{unit}]'), return_inverse=True)
+            self._periods[dim] = periods
+            self._codes[dim] = codes.reshape(-1).astype(np.int32)
+            self._categories[dim] = _period_labels(dim, periods)
+
+    def _dimension_codes(self, dim, values):
+        if dim in self._categories:
+            # Saat dibangun ulang, urutan kategori yang sudah ada dipertahankan
+            categories = list(self._categories[dim])
+            categories += [value for value in pd.unique(values) if value not in categories]
+            values = pd.Series(pd.Categorical(values, categories=categories))
+        elif not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype('category')
+        return values.cat.codes.to_numpy().astype(np.int32), list(values.cat.categories)
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def dimensions(self):
+        return list(self._codes)
+
+    # Fungsi untuk mengembalikan sel cube sebagai DataFrame (dipakai saat cube perlu dibangun ulang)
+    def cells(self):
+        n = self._n
+        cells = {'date': self.engine.df['date']}
+        for dim in self._dimensions:
+            cells[dim] = pd.Categorical.from_codes(self._codes[dim][:n], categories=self._categories[dim])
+        for m in self.measures:
+            cells[m] = self._sums[m][:n]
+        cells['row_count'] = self._counts[:n]
+        return pd.DataFrame(cells)
+
+    # Fungsi untuk menambahkan baris mentah baru ke cube (biaya sebanding dengan baris baru)
+    def append(self, df):
+        if not df.empty:
+            self.append_cells(aggregate_cells(df, self._dimensions, self.measures))
+
+    # Fungsi untuk menambahkan sel yang sudah diagregasi (kolom: date, dimensi, ukuran, row_count).
+    # Sel boleh berisi nilai negatif (koreksi/delta), karena roll-up hanya menjumlahkan sel.
+    def append_cells(self, cells):
+        if cells.empty:
+            return
+        dates = cells['date'].to_numpy().astype(self.engine.dates.dtype)
+        last_date = self.engine.dates[-1] if self._n else None
+        new_codes = {}
+        rebuild = last_date is not None and dates.min() < last_date
+        for dim in self._dimensions:
+            values = cells[dim]
+            if isinstance(values.dtype, pd.CategoricalDtype) and list(values.cat.categories) == self._categories[dim]:
+                new_codes[dim] = values.cat.codes.to_numpy().astype(np.int32)
+            else:
+                # Kategori baru ditambahkan di akhir daftar kategori dimensi
+                for value in pd.unique(values):
+                    if value not in self._categories[dim]:
+                        self._categories[dim].append(value)
+                new_codes[dim] = pd.Categorical(values, categories=self._categories[dim]).codes.astype(np.int32)
+        for dim, unit in DERIVED_DIMENSIONS.items():
+            periods = dates.astype(f'datetime64[{unit}]')
+            known = self._periods[dim]
+            unseen = np.setdiff1d(periods, known)
+            if len(unseen) and len(known) and unseen.min() < known[-1]:
+                rebuild = True
+            elif len(unseen):
+                self._periods[dim] = np.concatenate([known, unseen])
+                self._categories[dim] = self._categories[dim] + _period_labels(dim, unseen)
+            new_codes[dim] = np.searchsorted(self._periods[dim], periods).astype(np.int32)
+
+        if rebuild:
+            # Data terlambat (tanggal lebih awal dari sel terakhir): bangun ulang dari sel, bukan baris mentah
+            self._init_cells(pd.concat([self.cells(), cells], ignore_index=True))
+            return
+
+        self.engine.append(cells[['date'] + [col for col in ('season', 'weather_condition') if col in cells.columns]])
+        n = self._n
+        self._counts = append_to_buffer(self._counts, n, cells['row_count'].to_numpy(dtype=np.float64))
+        for m in self.measures:
+            self._sums[m] = append_to_buffer(self._sums[m], n, cells[m].to_numpy(dtype=np.float64))
+        for dim, codes in new_codes.items():
+            self._codes[dim] = append_to_buffer(self._codes[dim], n, codes)
+        self._n = n + len(cells)
+
+    # Fungsi roll-up: agregasi sel cube yang lolos filter menurut dimensi `by`.
+    # how='sum' menjumlahkan ukuran, how='mean' memberi rata-rata per baris mentah.
+    def rollup(self, by, start_date, end_date, seasons_filter=None, weather_filter=None,
+               measures=None, how='sum'):
+        measures = measures or self.measures
+        lo, hi, rows = self.engine.positions(start_date, end_date, seasons_filter, weather_filter)
+        selection = slice(lo, hi) if rows is None else rows
+
+        counts = self._counts[selection]
+        if by:
+            shape = tuple(len(self._categories[dim]) for dim in by)
+            keys = np.ravel_multi_index([self._codes[dim][selection] for dim in by], shape)
+        else:
+            shape = (1,)
+            keys = np.zeros(len(counts), dtype=np.intp)
+        size = int(np.prod(shape))
+
+        row_counts = np.bincount(keys, weights=counts, minlength=size)
+        present = np.flatnonzero(row_counts > 0)
+
+        result = {}
+        for dim, codes in zip(by, np.unravel_index(present, shape)):
+            result[dim] = pd.Categorical.from_codes(codes, categories=self._categories[dim])
+        for m in measures:
+            totals = np.bincount(keys, weights=self._sums[m][selection], minlength=size)[present]
+            if how == 'mean':
+                result[m] = totals / row_counts[present]
+            elif self._integer[m]:
+                result[m] = np.rint(totals).astype(np.int64)
+            else:
+                result[m] = totals
+        return pd.DataFrame(result, columns=list(by) + list(measures))
+
+
+# Grain cube harian dan jam-an sesuai filter dan grafik dashboard
+DAY_CUBE_DIMENSIONS = ['season', 'weather_condition', 'workingday']
+HOUR_CUBE_DIMENSIONS = ['season', 'weather_condition', 'workingday', 'hour']
+
+
+def build_cubes(day_df, hour_df):
+    return OlapCube(day_df, DAY_CUBE_DIMENSIONS), OlapCube(hour_df, HOUR_CUBE_DIMENSIONS)
@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import logging
+import weakref
+import threading
+import contextlib
+import tracemalloc
+from collections import Counter
+
+logger = logging.getLogger('dashboard.profiling')
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+# Profiling aktif secara default jika environment variable DASHBOARD_PROFILE=1
+def enabled_from_env():
+    return os.environ.get('DASHBOARD_PROFILE', '0') not in ('', '0', 'false')
+
+
+# tracemalloc bersifat global per proses, sedangkan sesi Streamlit berjalan di thread masing-masing.
+# Pemakai tracing dihitung per thread: tracing dimulai oleh pemakai pertama dan dihentikan oleh
+# pemakai terakhir, sehingga satu sesi tidak mematikan tracing sesi lain dan tracing tidak tertinggal aktif.
+_tracing_lock = threading.Lock()
+_tracing_threads = Counter()
+_owns_tracing = False
+
+
+# owner: thread pemakai (default thread saat ini); dikembalikan agar bisa dilepas dari thread lain
+def acquire_tracing(owner=None):
+    global _owns_tracing
+    owner = owner or threading.get_ident()
+    with _tracing_lock:
+        if not _tracing_threads and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _owns_tracing = True
+        _tracing_threads[owner] += 1
+    return owner
+
+
+def release_tracing(owner=None):
+    global _owns_tracing
+    with _tracing_lock:
+        ident = owner or threading.get_ident()
+        _tracing_threads[ident] -= 1
+        if _tracing_threads[ident] <= 0:
+            del _tracing_threads[ident]
+        if not _tracing_threads and _owns_tracing:
+            tracemalloc.stop()
+            _owns_tracing = False
+
+
+# Fungsi untuk mengukur satu tahap: waktu wall (ms) dan puncak memori Python (KiB, lewat tracemalloc).
+# Puncak memori hanya diukur jika diminta dan tracemalloc aktif (tracemalloc memperlambat alokasi).
+# Puncak tracemalloc juga global: jika thread lain sedang men-trace (mis. beberapa sesi dalam mode
+# debug sekaligus), reset_peak akan merusak ukuran sesi lain, jadi peak_kib dikosongkan (None).
+@contextlib.contextmanager
+def measure(stats, trace_memory=True):
+    with _tracing_lock:
+        tracing = (trace_memory and tracemalloc.is_tracing()
+                   and set(_tracing_threads) <= {threading.get_ident()})
+        if tracing:
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats['wall_ms'] = (time.perf_counter() - start) * 1000
+        stats['peak_kib'] = (tracemalloc.get_traced_memory()[1] - base) / 1024 if tracing else None
+
+
+# Fungsi untuk menjalankan func(*args) dengan pengukuran; mengembalikan (hasil, statistik)
+def call_measured(func, *args, trace_memory=False):
+    if trace_memory:
+        acquire_tracing()
+    try:
+        with measure({}, trace_memory) as stats:
+            result = func(*args)
+    finally:
+        if trace_memory:
+            release_tracing()
+    return result, stats
+
+
+# Pencatat tahap per rerun: setiap tahap (load, filter, aggregate, render) dicatat sebagai satu
+# record berisi nama tahap, section (jika ada), waktu wall, dan puncak memori. Tahap tidak bersarang.
+class Profiler:
+    def __init__(self, enabled=True, trace_memory=True, run_id=None):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.run_id = run_id or f"{time.time():.3f}"
+        self.records = []
+        # Tracing dilepas oleh stop(), atau paling lambat saat objek profiler dibuang
+        self._release = weakref.finalize(self, release_tracing, acquire_tracing()) if self.trace_memory else None
+
+    @contextlib.contextmanager
+    def stage(self, name, section=None):
+        if not self.enabled:
+            yield
+            return
+        with measure({'stage': name, 'section': section}, self.trace_memory) as stats:
+            yield
+        self.records.append(stats)
+
+    # Fungsi untuk menambahkan record yang diukur di tempat lain (mis. render di proses worker)
+    def add(self, name, stats, section=None):
+        if self.enabled and stats is not None:
+            self.records.append({'stage': name, 'section': section,
+                                 'wall_ms': stats.get('wall_ms'), 'peak_kib': stats.get('peak_kib')})
+
+    def total_ms(self, name=None):
+        return sum(r['wall_ms'] for r in self.records if name is None or r['stage'] == name)
+
+    # Fungsi untuk menulis setiap record sebagai satu baris log JSON terstruktur
+    def log_json(self):
+        for record in self.records:
+            logger.info(json.dumps({'run_id': self.run_id, **record}))
+
+    # Fungsi untuk melepas tracing; aman dipanggil lebih dari sekali (dipanggil di blok finally)
+    def stop(self):
+        if self._release is not None:
+            self._release()
+
+
+# Fungsi untuk membuat profiler satu rerun yang disimpan di state sesi (mis. st.session_state).
+# Streamlit menghentikan skrip di tengah jalan dengan exception saat widget berubah, sehingga
+# profiler.stop() di akhir skrip terlewat; profiler run yang terhenti itu dilepas di awal rerun berikutnya.
+def session_profiler(state, enabled, key='_profiler'):
+    previous = state.get(key)
+    if previous is not None:
+        previous.stop()
+    profiler = Profiler(enabled=enabled)
+    state[key] = profiler
+    return profiler
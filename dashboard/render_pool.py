@@ -0,0 +1,160 @@
+import os
+import sys
+import types
+import threading
+import contextlib
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+# Jumlah proses render default: satu per section bergambar, dibatasi jumlah CPU
+DEFAULT_WORKERS = min(10, os.cpu_count() or 1)
+
+
+# Inisialisasi proses worker: backend non-interaktif Agg, lalu impor modul section sekali
+# agar biaya impor matplotlib/seaborn tidak ditanggung oleh render pertama
+def _init_worker():
+    import matplotlib
+    matplotlib.use('Agg')
+    import sections  # noqa: F401
+
+
+# Job render mengembalikan bytes gambar beserta waktu render (dan puncak memori jika trace_memory)
+def _render_task(name, data, image_format, trace_memory=False):
+    import sections
+    from profiling import call_measured
+    return call_measured(sections.render_image, name, data, image_format, trace_memory=trace_memory)
+
+
+def _ping():
+    return os.getpid()
+
+
+# Streamlit menjalankan script dashboard sebagai modul __main__, dan multiprocessing (spawn)
+# akan menjalankan ulang modul itu di setiap worker baru. Selama worker dibuat, __main__
+# diganti sementara dengan modul kosong agar worker hanya mengimpor modul section. Penggantian ini
+# berlaku untuk seluruh proses, jadi hanya dilakukan saat pool dibuat (semua worker dinyalakan
+# sekaligus, submit berikutnya tidak membuat proses baru) dan dijalankan bergantian antar pool.
+_main_swap_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _without_main_script():
+    with _main_swap_lock:
+        main_module = sys.modules.get('__main__')
+        sys.modules['__main__'] = types.ModuleType('__main__')
+        try:
+            yield
+        finally:
+            sys.modules['__main__'] = main_module
+
+
+# Pool render figure: setiap section dirender secara independen di proses terpisah dan
+# dikembalikan sebagai bytes gambar. Dengan workers=0, render dilakukan berurutan di proses ini.
+# Jika sebuah worker mati (BrokenProcessPool), pool dibuat ulang dan job dikirim ulang sekali.
+class RenderPool:
+    def __init__(self, workers=DEFAULT_WORKERS, image_format='png'):
+        self.workers = workers
+        self.image_format = image_format
+        self._executor = None
+        self._lock = threading.Lock()
+        self.restarts = 0
+        # Render di proses ini memakai state global pyplot, jadi dijalankan bergantian antar thread
+        # (sesi Streamlit dan pemanasan cache di latar belakang)
+        self._inline_lock = threading.Lock()
+        if workers > 0:
+            self._executor = self._start_executor()
+
+    def _start_executor(self):
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+        )
+        # Semua worker dinyalakan di awal (di dalam jendela penggantian __main__), sehingga rerun
+        # pertama tidak menunggu proses start dan submit berikutnya tidak pernah membuat proses baru
+        with _without_main_script():
+            pings = [executor.submit(_ping) for _ in range(self.workers)]
+        for future in pings:
+            future.result()
+        return executor
+
+    # Fungsi untuk mengganti pool yang rusak; False jika pool sudah dimatikan
+    def _restart(self, broken):
+        with self._lock:
+            if self._executor is None:
+                return False
+            if self._executor is broken:
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._start_executor()
+                self.restarts += 1
+            return True
+
+    def _submit_pooled(self, outer, args, retries):
+        executor = self._executor
+        if executor is None:
+            outer.set_exception(RuntimeError("Pool render sudah dimatikan"))
+            return
+        try:
+            inner = executor.submit(_render_task, *args)
+        except BrokenProcessPool as e:
+            if retries and self._restart(executor):
+                self._submit_pooled(outer, args, retries - 1)
+            else:
+                outer.set_exception(e)
+            return
+
+        def done(inner):
+            if inner.cancelled():
+                outer.cancel()
+                return
+            error = inner.exception()
+            if isinstance(error, BrokenProcessPool) and retries and self._restart(executor):
+                self._submit_pooled(outer, args, retries - 1)
+            elif error is not None:
+                outer.set_exception(error)
+            else:
+                outer.set_result(inner.result())
+        inner.add_done_callback(done)
+
+    # Fungsi untuk mengirim satu job render; mengembalikan Future berisi (bytes gambar, statistik render)
+    def submit(self, name, data, trace_memory=False):
+        future = Future()
+        if self._executor is not None:
+            self._submit_pooled(future, (name, data, self.image_format, trace_memory), retries=1)
+            return future
+        try:
+            with self._inline_lock:
+                future.set_result(_render_task(name, data, self.image_format, trace_memory))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    # Fungsi untuk mengirim banyak job sekaligus: {nama_section: data} -> {nama_section: Future}
+    def submit_many(self, jobs, trace_memory=False):
+        return {name: self.submit(name, data, trace_memory) for name, data in jobs.items()}
+
+    # Fungsi untuk mengambil hasil render sebagai (nama_section, bytes gambar, statistik render).
+    # stream=True: urutan selesai render; stream=False: urutan section semula.
+    def results(self, futures, stream=False):
+        if stream:
+            names = {future: name for name, future in futures.items()}
+            for future in as_completed(names):
+                yield (names[future],) + future.result()
+        else:
+            for name, future in futures.items():
+                yield (name,) + future.result()
+
+    def render_many(self, jobs):
+        return {name: image for name, image, _ in self.results(self.submit_many(jobs))}
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Jumlah worker bisa diatur lewat environment variable DASHBOARD_RENDER_WORKERS (0 = tanpa pool)
+def workers_from_env():
+    return int(os.environ.get('DASHBOARD_RENDER_WORKERS', DEFAULT_WORKERS))
@@ -0,0 +1,306 @@
+import os
+import re
+import html
+import json
+import time
+import hashlib
+import argparse
+import itertools
+from concurrent.futures import FIRST_COMPLETED, wait
+
+import pandas as pd
+
+import data_store
+import sections
+import hour_backend
+from filter_engine import FilterEngine
+from olap_cube import OlapCube, DAY_CUBE_DIMENSIONS
+from moment_stats import MomentStats
+from render_pool import RenderPool, workers_from_env
+
+# Pembagian periode laporan: nama -> frekuensi pandas (None = seluruh rentang data)
+PERIODS = {'month': 'M', 'quarter': 'Q', 'year': 'Y', 'all': None}
+# Pilihan kategori per filter: 'all' (semua kategori), 'each' (semua + tiap kategori), 'subsets' (semua subset tidak kosong)
+SUBSET_MODES = ['all', 'each', 'subsets']
+FORMATS = ['html', 'png', 'json']
+# Batas job render yang sedang berjalan per worker, agar data section yang menunggu render tidak menumpuk
+IN_FLIGHT_PER_WORKER = 4
+
+# Bagian laporan sesuai urutan dashboard (metrik dan tabel cluster ditulis terpisah)
+REPORT_SECTIONS = ['seasonal', 'hourly', 'weather', 'monthly', 'weekday', 'correlation', 'weather_scatter',
+                   'seasonal_hourly', 'user_type', 'clustering', 'day_clustering']
+
+
+# Fungsi untuk memuat sumber data sama seperti dashboard: (mesin filter harian, cube harian, backend jam-an, statistik harian)
+def load_sources():
+    day_df = data_store.load_table('day', compact=data_store.compact_from_env())
+    return FilterEngine(day_df), OlapCube(day_df, DAY_CUBE_DIMENSIONS), hour_backend.open_hour_backend(), MomentStats(day_df)
+
+
+def _slug(text):
+    return re.sub(r'[^A-Za-z0-9]+', '-', str(text)).strip('-')
+
+
+def _period_ranges(day_engine, period):
+    min_date, max_date = day_engine.min_date, day_engine.max_date
+    if PERIODS[period] is None:
+        return [('semua', min_date.date(), max_date.date())]
+    ranges = []
+    for p in pd.period_range(min_date, max_date, freq=PERIODS[period]):
+        start = max(p.start_time.normalize(), min_date)
+        end = min(p.end_time.normalize(), max_date)
+        ranges.append((str(p), start.date(), end.date()))
+    return ranges
+
+
+# Fungsi untuk membuat daftar pilihan kategori; None berarti semua kategori (tanpa filter)
+def _selections(categories, mode):
+    if mode == 'all':
+        return [None]
+    if mode == 'each':
+        return [None] + [[category] for category in categories]
+    return [None] + [list(combo) for size in range(1, len(categories))
+                     for combo in itertools.combinations(categories, size)]
+
+
+# Fungsi untuk membuat grid varian laporan: periode x pilihan musim x pilihan cuaca
+def build_grid(day_engine, period='month', seasons='each', weather='each'):
+    variants = []
+    for period_label, start_date, end_date in _period_ranges(day_engine, period):
+        for season_choice in _selections(day_engine.categories('season'), seasons):
+            for weather_choice in _selections(day_engine.categories('weather_condition'), weather):
+                name = '_'.join([period_label, '+'.join(season_choice or ['semua-musim']),
+                                 '+'.join(weather_choice or ['semua-cuaca'])])
+                variants.append({
+                    'id': _slug(name),
+                    'period': period_label,
+                    'start_date': start_date,
+                    'end_date': end_date,
+                    'seasons': season_choice,
+                    'weather': weather_choice,
+                })
+    return variants
+
+
+# Kategori musim/cuaca yang benar-benar muncul di rentang tanggal (di tabel harian maupun jam-an)
+def _present_categories(sources, start_date, end_date):
+    _, day_cube, hour_cube, _ = sources
+    present = {}
+    for col in ('season', 'weather_condition'):
+        values = set()
+        for cube in (day_cube, hour_cube):
+            values.update(cube.rollup([col], start_date, end_date, measures=['total_rentals'])[col].astype(str))
+        present[col] = values
+    return present
+
+
+# Kunci filter efektif: pilihan kategori dipangkas ke kategori yang muncul di periode, sehingga
+# varian yang memilih baris yang sama (mis. musim Winter + Summer di bulan Juli) dihitung sekali
+def effective_key(variant, present):
+    key = [variant['start_date'].isoformat(), variant['end_date'].isoformat()]
+    for col, selected in (('season', variant['seasons']), ('weather_condition', variant['weather'])):
+        if selected is None or present[col] <= set(selected):
+            key.append(('*',))
+        else:
+            key.append(tuple(sorted(present[col] & set(selected))))
+    return tuple(key)
+
+
+# Fungsi untuk mengubah data section menjadi struktur yang bisa ditulis sebagai JSON
+def to_jsonable(value):
+    if isinstance(value, pd.DataFrame):
+        if not isinstance(value.index, pd.RangeIndex):
+            value = value.reset_index()
+        return json.loads(value.to_json(orient='records', date_format='iso'))
+    if isinstance(value, dict):
+        return {str(k): to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    if hasattr(value, 'tolist'):
+        value = value.tolist()
+    if isinstance(value, float) and value != value:
+        return None
+    return value
+
+
+def _filter_text(variant):
+    seasons = ', '.join(variant['seasons']) if variant['seasons'] else 'semua'
+    weather = ', '.join(variant['weather']) if variant['weather'] else 'semua'
+    return (f"{variant['start_date'].strftime('%d %B %Y')} hingga {variant['end_date'].strftime('%d %B %Y')} | "
+            f"Musim: {seasons} | Kondisi Cuaca: {weather}")
+
+
+HTML_STYLE = """body{font-family:sans-serif;max-width:1100px;margin:auto;padding:1em;color:#222}
+img{max-width:100%}.metrics{display:flex;gap:2em}.metric b{display:block;font-size:1.6em}
+table{border-collapse:collapse}td,th{border:1px solid #ccc;padding:4px 8px;text-align:right}
+.note{color:#666;font-size:.9em}"""
+
+
+# Fungsi untuk menulis satu laporan HTML statis (gambar merujuk ke file grafik bersama)
+def render_html(variant, section_data, chart_files):
+    parts = [f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(variant['id'])}</title>",
+             f"<style>{HTML_STYLE}</style></head><body>",
+             "<h1>Laporan Penyewaan Sepeda (Bike Sharing)</h1>",
+             f"<p>{html.escape(_filter_text(variant))}</p>",
+             "<h2>Metrik Utama (Berdasarkan Filter Harian)</h2>"]
+    metrics = section_data['metrics']
+    if metrics is None:
+        parts.append("<p>Tidak ada data untuk filter yang dipilih pada data harian.</p>")
+    else:
+        parts.append("<div class='metrics'>" + ''.join(
+            f"<div class='metric'>{label}<b>{metrics[col]:,}</b></div>"
+            for label, col in (("Total Penyewaan", 'total_rentals'), ("Total Pengguna Casual", 'casual'),
+                               ("Total Pengguna Registered", 'registered'))) + "</div>")
+    parts.append("<h2>Visualisasi Data</h2>")
+    for name in REPORT_SECTIONS:
+        if name in sections.SECTION_TITLES:
+            parts.append(f"<h3>{html.escape(sections.SECTION_TITLES[name])}</h3>")
+        data = section_data[name]
+        if data is None:
+            parts.append("<p class='note'>Tidak ada data untuk filter yang dipilih.</p>")
+            continue
+        if name in chart_files:
+            parts.append(f"<img src='{html.escape(chart_files[name])}' alt='{name}'>")
+        note = sections.approximation_note(data)
+        if note:
+            parts.append(f"<p class='note'>{html.escape(note)}</p>")
+        if name == 'clustering':
+            if data['note']:
+                parts.append(f"<p class='note'>{html.escape(data['note'])}</p>")
+            parts.append("<h4>Ringkasan Bulan per Cluster Penggunaan (Total Rentals)</h4><ul>")
+            for cluster_name, months in data['summary'].items():
+                parts.append(f"<li><b>Cluster {cluster_name}:</b> {', '.join(months) or 'Tidak ada bulan dalam cluster ini'}</li>")
+            parts.append("</ul>")
+        elif name == 'day_clustering':
+            profile = data['profile'].rename(columns={'days': 'jumlah_hari'})
+            parts.append(profile.to_html(float_format=lambda v: f"{v:,.2f}"))
+    parts.append("</body></html>")
+    return '\n'.join(parts)
+
+
+def _write(path, content):
+    mode = 'wb' if isinstance(content, bytes) else 'w'
+    with open(path, mode) as f:
+        f.write(content)
+
+
+# Mesin ekspor laporan batch tanpa Streamlit: grid filter dikelompokkan per filter efektif,
+# setiap kelompok dihitung sekali dari cube/statistik yang dibangun sekali, lalu grafik kelompok
+# dirender paralel di pool proses. Laporan per varian (HTML/JSON) merujuk ke grafik dan data
+# kelompoknya, jadi ribuan varian tidak berarti ribuan kali render.
+def export_reports(out_dir, period='month', seasons='each', weather='each', formats=FORMATS,
+                   workers=None, image_format='png', sources=None):
+    start = time.perf_counter()
+    sources = sources or load_sources()
+    day_engine = sources[0]
+    variants = build_grid(day_engine, period, seasons, weather)
+    need_charts = 'png' in formats or 'html' in formats
+    for sub in ('reports', 'charts', 'data'):
+        os.makedirs(os.path.join(out_dir, sub), exist_ok=True)
+
+    # Kelompokkan varian per filter efektif (kategori yang muncul dihitung sekali per periode)
+    present_by_period = {}
+    groups = {}
+    for variant in variants:
+        period_key = (variant['start_date'], variant['end_date'])
+        if period_key not in present_by_period:
+            present_by_period[period_key] = _present_categories(sources, *period_key)
+        key = effective_key(variant, present_by_period[period_key])
+        variant['group'] = hashlib.sha1(repr(key).encode()).hexdigest()[:12]
+        groups.setdefault(key, []).append(variant)
+
+    render_pool = RenderPool(workers_from_env() if workers is None else workers, image_format) if need_charts else None
+    max_in_flight = max(1, IN_FLIGHT_PER_WORKER * (render_pool.workers if render_pool else 1))
+    in_flight = {}
+    renders = 0
+
+    def collect(block):
+        nonlocal renders
+        if not in_flight:
+            return
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED) if block else ([f for f in in_flight if f.done()], None)
+        for future in done:
+            image, _ = future.result()
+            _write(in_flight.pop(future), image)
+            renders += 1
+
+    index = []
+    try:
+        for key, members in groups.items():
+            representative = members[0]
+            group_id = representative['group']
+            section_context = sections.SectionContext(
+                *sources, representative['start_date'], representative['end_date'],
+                representative['seasons'] or [], representative['weather'] or [])
+            section_data = {name: sections.compute_section(name, section_context) for name in sections.SECTIONS}
+
+            chart_files = {}
+            if need_charts:
+                for name in REPORT_SECTIONS:
+                    if section_data[name] is None or not sections.has_figure(name):
+                        continue
+                    chart_files[name] = f"../charts/{group_id}-{name}.{image_format}"
+                    while len(in_flight) >= max_in_flight:
+                        collect(block=True)
+                    future = render_pool.submit(name, section_data[name])
+                    in_flight[future] = os.path.join(out_dir, 'charts', f"{group_id}-{name}.{image_format}")
+                    collect(block=False)
+
+            if 'json' in formats:
+                _write(os.path.join(out_dir, 'data', f"{group_id}.json"),
+                       json.dumps(to_jsonable(section_data), default=str))
+            for variant in members:
+                record = {
+                    'id': variant['id'], 'period': variant['period'],
+                    'start_date': variant['start_date'].isoformat(), 'end_date': variant['end_date'].isoformat(),
+                    'seasons': variant['seasons'], 'weather': variant['weather'], 'group': group_id,
+                    'metrics': section_data['metrics'],
+                }
+                if 'json' in formats:
+                    summary = section_data['clustering']['summary'] if section_data['clustering'] else None
+                    _write(os.path.join(out_dir, 'reports', f"{variant['id']}.json"), json.dumps(
+                        {**record, 'cluster_summary': summary, 'data': f"../data/{group_id}.json",
+                         'charts': chart_files}, default=str))
+                if 'html' in formats:
+                    _write(os.path.join(out_dir, 'reports', f"{variant['id']}.html"),
+                           render_html(variant, section_data, chart_files))
+                index.append(record)
+        while in_flight:
+            collect(block=True)
+    finally:
+        if render_pool is not None:
+            render_pool.shutdown()
+
+    summary = {'variants': len(variants), 'groups': len(groups), 'renders': renders,
+               'seconds': time.perf_counter() - start}
+    _write(os.path.join(out_dir, 'index.json'), json.dumps({'summary': summary, 'reports': index}, default=str))
+    if 'html' in formats:
+        rows = ''.join(
+            f"<tr><td><a href='reports/{html.escape(r['id'])}.html'>{html.escape(r['id'])}</a></td>"
+            f"<td>{(r['metrics'] or {}).get('total_rentals', 0):,}</td></tr>" for r in index)
+        _write(os.path.join(out_dir, 'index.html'),
+               f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Laporan</title><style>{HTML_STYLE}</style></head>"
+               f"<body><h1>Laporan Penyewaan Sepeda</h1><p>{len(index):,} laporan</p>"
+               f"<table><tr><th>Laporan</th><th>Total Penyewaan</th></tr>{rows}</table></body></html>")
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ekspor laporan statis (HTML/PNG/JSON) untuk grid filter tanpa Streamlit.")
+    parser.add_argument("--out", default="reports", help="Direktori output")
+    parser.add_argument("--period", choices=list(PERIODS), default="month", help="Pembagian rentang tanggal")
+    parser.add_argument("--seasons", choices=SUBSET_MODES, default="each", help="Pilihan musim per periode")
+    parser.add_argument("--weather", choices=SUBSET_MODES, default="each", help="Pilihan kondisi cuaca per periode")
+    parser.add_argument("--formats", nargs='+', choices=FORMATS, default=FORMATS)
+    parser.add_argument("--image-format", choices=['png', 'svg'], default='png')
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah proses render (default: DASHBOARD_RENDER_WORKERS)")
+    args = parser.parse_args(argv)
+
+    summary = export_reports(args.out, args.period, args.seasons, args.weather, args.formats,
+                             args.workers, args.image_format)
+    print(f"{summary['variants']:,} laporan ({summary['groups']:,} filter unik, {summary['renders']:,} grafik) "
+          f"ditulis ke {args.out} dalam {summary['seconds']:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,499 @@
+import io
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+import clustering
+import downsample
+import data_store
+
+# Set style seaborn untuk plot yang lebih menarik
+sns.set(style='darkgrid')
+
+# Urutan kategorikal untuk plot
+season_order = ['Spring', 'Summer', 'Fall', 'Winter']
+month_order = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+weather_order = ['Clear/Cloudy', 'Mist/Cloudy', 'Light Snow/Rain', 'Heavy Rain/Fog']
+cluster_order = ['Rendah', 'Sedang', 'Tinggi']
+
+# Resolusi gambar sama dengan default st.pyplot
+FIGURE_DPI = 200
+# Lebar konten maksimum Streamlit; gambar yang lebih lebar di-resize ulang oleh st.image pada
+# setiap rerun, jadi ukuran gambar disesuaikan sekali saat render
+MAX_IMAGE_WIDTH = 1460
+
+
+# Konteks satu pilihan filter: frame harian yang sudah difilter dihitung secara malas,
+# sehingga section yang seluruhnya dilayani dari cache tidak menyentuh pandas sama sekali.
+# day_df bisa diisi dari cache (frame terfilter hasil pemanasan preset).
+class SectionContext:
+    def __init__(self, day_engine, day_cube, hour_cube, day_stats, start_date, end_date, seasons_filter, weather_filter,
+                 day_df=None):
+        self.day_engine = day_engine
+        self.day_cube = day_cube
+        self.hour_cube = hour_cube
+        self.day_stats = day_stats
+        self.filter_args = (start_date, end_date, seasons_filter, weather_filter)
+        self._day_df = day_df
+        self._monthly = None
+
+    @property
+    def day_df(self):
+        if self._day_df is None:
+            self._day_df = self.day_engine.filter(*self.filter_args)
+        return self._day_df
+
+    # Agregat bulanan dipakai bagian 4 dan bagian clustering, jadi dihitung sekali per konteks
+    @property
+    def monthly(self):
+        if self._monthly is None:
+            monthly = self.day_cube.rollup(["year_month"], *self.filter_args).rename(columns={
+                'casual': 'total_casual',
+                'registered': 'total_registered',
+                'total_rentals': 'total_all_rentals'
+            })
+            monthly['year_month_str'] = monthly['year_month'].astype(str)
+            self._monthly = monthly
+        return self._monthly
+
+
+# --- Agregasi per Section ---
+# Setiap fungsi compute_* mengembalikan data agregat section, atau None jika tidak ada data
+
+def compute_metrics(ctx):
+    totals = ctx.day_cube.rollup([], *ctx.filter_args)
+    if totals.empty:
+        return None
+    return {col: int(totals[col].iloc[0]) for col in ['total_rentals', 'casual', 'registered']}
+
+
+def compute_seasonal(ctx):
+    seasonal_rentals = ctx.day_cube.rollup(["season", "year"], *ctx.filter_args, measures=["total_rentals"])
+    if seasonal_rentals.empty:
+        return None
+    seasonal_rentals['season'] = pd.Categorical(seasonal_rentals['season'], categories=season_order, ordered=True)
+    return seasonal_rentals.sort_values('season')
+
+
+def compute_hourly(ctx):
+    hourly_pattern = ctx.hour_cube.rollup(["workingday", "hour"], *ctx.filter_args, measures=["total_rentals"], how="mean")
+    if hourly_pattern.empty:
+        return None
+    # Maksimal 24 titik per seri (satu per jam), jadi tidak perlu downsampling
+    return hourly_pattern
+
+
+def compute_weather(ctx):
+    weather_rentals = ctx.day_cube.rollup(["weather_condition", "year"], *ctx.filter_args, measures=["total_rentals"])
+    if weather_rentals.empty:
+        return None
+    existing_weather = weather_rentals['weather_condition'].unique().tolist()
+    weather_order_filtered = [cond for cond in weather_order if cond in existing_weather]
+    weather_rentals['weather_condition'] = pd.Categorical(weather_rentals['weather_condition'], categories=weather_order_filtered, ordered=True)
+    return weather_rentals.sort_values('weather_condition')
+
+
+def compute_monthly(ctx):
+    if ctx.monthly.empty:
+        return None
+    monthly_agg = ctx.monthly[['year_month_str', 'total_casual', 'total_registered', 'total_all_rentals']]
+    # Satu-satunya grafik garis yang panjang serinya bertambah mengikuti rentang tanggal
+    return downsample.downsample_lines(monthly_agg, ['total_casual', 'total_registered', 'total_all_rentals'])
+
+
+def compute_weekday(ctx):
+    if ctx.day_df.empty:
+        return None
+    # Pada skema ringkas, hari dalam seminggu dihitung dari tanggal hanya untuk baris yang lolos filter
+    day_df_viz5 = data_store.with_calendar(ctx.day_df, ['weekday'])[['weekday', 'total_rentals', 'casual', 'registered']].copy()
+    day_df_viz5['weekday'] = pd.Categorical(day_df_viz5['weekday'], categories=day_order, ordered=True)
+    return day_df_viz5
+
+
+numerical_cols_weather = ['temperature', 'feeling_temperature', 'humidity', 'windspeed', 'casual', 'registered', 'total_rentals']
+weather_vars_scatter = ['temperature', 'feeling_temperature', 'humidity', 'windspeed']
+
+
+# Korelasi dihitung dari statistik cukup per hari (lihat moment_stats.py), bukan dari baris mentah
+def compute_correlation(ctx):
+    return ctx.day_stats.correlation(*ctx.filter_args)
+
+
+# Titik scatter tetap diambil dari data harian; garis regresi dan pita kepercayaan 95% dihitung
+# dengan rumus tertutup dari statistik cukup (pengganti regplot yang melakukan bootstrap).
+# Jika titik melebihi batas, scatter diganti histogram 2-D yang dihitung di sini (bukan saat render).
+def compute_weather_scatter(ctx):
+    if ctx.day_df.empty:
+        return None
+    points = ctx.day_df[weather_vars_scatter + ['total_rentals']]
+    moments = ctx.day_stats.moments(*ctx.filter_args)
+    fits = {
+        var: ctx.day_stats.regression(var, 'total_rentals', *ctx.filter_args,
+                                      x_range=(points[var].min(), points[var].max()), moments=moments)
+        for var in weather_vars_scatter
+    }
+    max_points = downsample.max_points_from_env()
+    if len(points) <= max_points:
+        return {'points': points, 'fits': fits}
+    density = {var: downsample.density_grid(points[var], points['total_rentals']) for var in weather_vars_scatter}
+    return {
+        'points': None,
+        'density': density,
+        'fits': fits,
+        'approximation': (
+            f"Scatter ditampilkan sebagai histogram 2-D ({downsample.DENSITY_BINS}x{downsample.DENSITY_BINS} bin) "
+            f"karena {len(points):,} titik melebihi batas {max_points:,} titik."
+        ),
+    }
+
+
+def compute_seasonal_hourly(ctx):
+    hourly_seasonal_pattern = ctx.hour_cube.rollup(["season", "workingday", "hour"], *ctx.filter_args, measures=["total_rentals"], how="mean")
+    if hourly_seasonal_pattern.empty:
+        return None
+    hourly_seasonal_pattern['season'] = pd.Categorical(hourly_seasonal_pattern['season'], categories=season_order, ordered=True)
+    hourly_seasonal_pattern = hourly_seasonal_pattern.sort_values(['season', 'workingday', 'hour'])
+    return hourly_seasonal_pattern
+
+
+def compute_user_type(ctx):
+    seasonal_user_type = ctx.day_cube.rollup(["season"], *ctx.filter_args, measures=['casual', 'registered'])
+    if seasonal_user_type.empty:
+        return None
+    seasonal_user_type_melted = seasonal_user_type.melt(id_vars=['season'], value_vars=['casual', 'registered'], var_name='user_type', value_name='total_rentals_sum') # ganti nama kolom agar tidak konflik
+    seasonal_user_type_melted['season'] = pd.Categorical(seasonal_user_type_melted['season'], categories=season_order, ordered=True)
+    return seasonal_user_type_melted.sort_values('season')
+
+
+# Label cluster yang dipakai jika nilai bulanan yang lolos filter lebih sedikit dari jumlah cluster:
+# satu nilai dianggap 'Sedang', dua nilai dibagi menjadi 'Rendah' dan 'Tinggi'
+cluster_label_codes = {1: [1], 2: [0, 2], 3: [0, 1, 2]}
+
+
+# Clustering bulanan memakai k-means 1-D optimal (natural breaks) atas total penyewaan bulanan
+# yang lolos filter, sehingga batas cluster mengikuti data, bukan ambang batas tetap.
+# Jumlah cluster dibatasi jumlah nilai bulanan yang berbeda (mis. filter satu atau dua bulan);
+# dalam kasus itu label hanya relatif terhadap data yang lolos filter dan keterangannya disimpan di 'note'.
+def compute_clustering(ctx):
+    if ctx.monthly.empty:
+        return None
+    monthly_totals = ctx.monthly[['year_month_str', 'total_all_rentals']].rename(columns={'total_all_rentals': 'total_rentals'})
+    values = monthly_totals['total_rentals'].to_numpy()
+    k = min(len(cluster_order), len(np.unique(values)))
+    labels, _ = clustering.optimal_kmeans_1d(values, k)
+    codes = np.asarray(cluster_label_codes[k])[labels]
+    monthly_totals['usage_cluster'] = pd.Categorical.from_codes(codes, categories=cluster_order, ordered=True)
+    # Ringkasan bulan per cluster disimpan sebagai list biasa agar bisa ditampilkan tanpa pandas
+    summary = {
+        cluster: monthly_totals.loc[monthly_totals['usage_cluster'] == cluster, 'year_month_str'].tolist()
+        for cluster in cluster_order
+    }
+    note = None
+    if k < len(cluster_order):
+        note = (f"Filter hanya memuat {len(values)} bulan ({k} nilai total berbeda), jadi bulan dibagi menjadi {k} cluster "
+                f"dan labelnya relatif terhadap data yang lolos filter, bukan terhadap seluruh rentang data.")
+    return {'monthly': monthly_totals, 'summary': summary, 'note': note}
+
+
+# Fitur clustering harian (multi-fitur): tipe pengguna dan cuaca kontinu
+day_cluster_features = ['casual', 'registered', 'temperature', 'humidity', 'windspeed']
+
+
+# Clustering harian dengan mini-batch k-means; cluster diurutkan menurut rata-rata total penyewaan.
+# Jika titik melebihi batas, scatter diganti histogram 2-D (registered vs casual) dengan pusat cluster
+# dari tabel profil, sama seperti scatter cuaca bagian 6.
+def compute_day_clustering(ctx):
+    if ctx.day_df.empty:
+        return None
+    day_df = ctx.day_df
+    labels, _ = clustering.minibatch_kmeans(day_df[day_cluster_features].to_numpy(), len(cluster_order))
+    labels = clustering.order_labels(labels, day_df['total_rentals'].to_numpy(dtype='float64'))
+    day_clusters = day_df[['date', 'total_rentals'] + day_cluster_features].reset_index(drop=True)
+    day_clusters['usage_cluster'] = pd.Categorical.from_codes(labels, categories=cluster_order, ordered=True)
+    profile = day_clusters.groupby('usage_cluster', observed=True)[['total_rentals'] + day_cluster_features].mean()
+    profile.insert(0, 'days', day_clusters.groupby('usage_cluster', observed=True).size())
+    max_points = downsample.max_points_from_env()
+    if len(day_clusters) <= max_points:
+        return {'days': day_clusters, 'profile': profile}
+    return {
+        'days': None,
+        'density': downsample.density_grid(day_clusters['registered'], day_clusters['casual']),
+        'profile': profile,
+        'approximation': (
+            f"Scatter ditampilkan sebagai histogram 2-D ({downsample.DENSITY_BINS}x{downsample.DENSITY_BINS} bin) "
+            f"dengan pusat cluster karena {len(day_clusters):,} titik melebihi batas {max_points:,} titik."
+        ),
+    }
+
+
+# --- Render Figure per Section ---
+
+def render_seasonal(seasonal_rentals):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(
+        data=seasonal_rentals,
+        x="season",
+        y="total_rentals",
+        hue="year",
+        palette="viridis",
+        ax=ax
+    )
+    ax.set_title("Total Penyewaan Sepeda Berdasarkan Musim dan Tahun")
+    ax.set_xlabel("Musim")
+    ax.set_ylabel("Total Penyewaan Sepeda")
+    ax.legend(title="Tahun")
+    ax.grid(True, axis='y', linestyle='--')
+    return fig
+
+
+def render_hourly(hourly_pattern):
+    fig, ax = plt.subplots(figsize=(12, 7))
+    sns.lineplot(
+        data=hourly_pattern,
+        x="hour",
+        y="total_rentals",
+        hue="workingday",
+        marker="o",
+        palette={"Working Day": "blue", "Non-Working Day": "red"},
+        ax=ax
+    )
+    ax.set_title("Pola Penyewaan Sepeda Rata-Rata per Jam Berdasarkan Tipe Hari")
+    ax.set_xlabel("Jam dalam Sehari")
+    ax.set_ylabel("Rata-Rata Jumlah Penyewaan Sepeda")
+    ax.set_xticks(range(0, 24))
+    ax.legend(title="Tipe Hari")
+    ax.grid(True, linestyle='--')
+    return fig
+
+
+def render_weather(weather_rentals):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.barplot(
+        data=weather_rentals,
+        x="weather_condition",
+        y="total_rentals",
+        hue="year",
+        palette="coolwarm",
+        ax=ax
+    )
+    ax.set_title("Total Penyewaan Sepeda Berdasarkan Kondisi Cuaca dan Tahun")
+    ax.set_xlabel("Kondisi Cuaca")
+    ax.set_ylabel("Total Penyewaan Sepeda")
+    ax.legend(title="Tahun")
+    ax.grid(True, axis='y', linestyle='--')
+    return fig
+
+
+def render_monthly(monthly_agg):
+    fig, ax = plt.subplots(figsize=(15, 7))
+    sns.lineplot(data=monthly_agg, x='year_month_str', y='total_all_rentals', marker='o', label='Total Penyewaan', color='purple', ax=ax)
+    sns.lineplot(data=monthly_agg, x='year_month_str', y='total_casual', marker='x', label='Pengguna Casual', color='orange', ax=ax)
+    sns.lineplot(data=monthly_agg, x='year_month_str', y='total_registered', marker='s', label='Pengguna Registered', color='green', ax=ax)
+    ax.set_title('Tren Penyewaan Sepeda Bulanan (2011-2012)')
+    ax.set_xlabel('Tahun-Bulan')
+    ax.set_ylabel('Jumlah Penyewaan')
+    ax.tick_params(axis='x', rotation=45)
+    ax.legend(title='Tipe Pengguna/Total')
+    ax.grid(True, linestyle='--')
+    return fig
+
+
+def render_weekday(day_df_viz5):
+    fig, axes = plt.subplots(1, 3, figsize=(18, 6))
+    panels = [
+        ('total_rentals', 'Distribusi Total Penyewaan per Hari', 'Total Penyewaan Harian'),
+        ('casual', 'Distribusi Pengguna Casual per Hari', 'Penyewaan Casual Harian'),
+        ('registered', 'Distribusi Pengguna Registered per Hari', 'Penyewaan Registered Harian'),
+    ]
+    for ax, (col, title, ylabel) in zip(axes, panels):
+        sns.boxplot(data=day_df_viz5, x='weekday', y=col, hue='weekday', palette='pastel', legend=False, ax=ax)
+        ax.set_title(title)
+        ax.set_xlabel('Hari')
+        ax.set_ylabel(ylabel)
+        ax.tick_params(axis='x', rotation=45)
+    fig.tight_layout()
+    return fig
+
+
+def render_correlation(correlation_matrix):
+    fig, ax = plt.subplots(figsize=(10, 8))
+    sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', fmt=".2f", linewidths=.5, ax=ax)
+    ax.set_title('Heatmap Korelasi Variabel Numerik (Termasuk Cuaca)')
+    return fig
+
+
+titles_scatter = ['Suhu vs. Total Penyewaan', 'Suhu Dirasakan vs. Total Penyewaan', 'Kelembapan vs. Total Penyewaan', 'Kecepatan Angin vs. Total Penyewaan']
+xlabels_scatter = ['Suhu Ternormalisasi', 'Suhu Dirasakan Ternormalisasi', 'Kelembapan Ternormalisasi', 'Kecepatan Angin Ternormalisasi']
+
+
+def render_weather_scatter(weather_scatter):
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+    fig.suptitle('Hubungan Variabel Cuaca Kontinu dengan Total Penyewaan Harian', fontsize=16)
+    for i, var in enumerate(weather_vars_scatter):
+        ax = axes[i // 2, i % 2]
+        if weather_scatter['points'] is not None:
+            sns.scatterplot(ax=ax, data=weather_scatter['points'], x=var, y='total_rentals', alpha=0.5)
+        else:
+            grid = weather_scatter['density'][var]
+            mesh = ax.pcolormesh(grid['x_edges'], grid['y_edges'], np.ma.masked_equal(grid['counts'].T, 0), cmap='Blues')
+            fig.colorbar(mesh, ax=ax, label='Jumlah Titik')
+        fit = weather_scatter['fits'][var]
+        if fit is not None:
+            line = fit['line']
+            ax.plot(line[var], line['total_rentals'], color='red')
+            ax.fill_between(line[var], line['lower'], line['upper'], color='red', alpha=0.15, linewidth=0)
+        ax.set_title(titles_scatter[i])
+        ax.set_xlabel(xlabels_scatter[i])
+        ax.set_ylabel('Total Penyewaan Harian')
+        ax.grid(True, linestyle='--')
+    fig.tight_layout(rect=[0, 0, 1, 0.96])
+    return fig
+
+
+def render_seasonal_hourly(hourly_seasonal_pattern):
+    g = sns.FacetGrid(hourly_seasonal_pattern, col="season", hue="workingday", col_wrap=2, height=5, aspect=1.5, palette={"Working Day": "blue", "Non-Working Day": "red"})
+    g.map(sns.lineplot, "hour", "total_rentals", marker="o")
+    g.set_axis_labels("Jam dalam Sehari", "Rata-Rata Jumlah Penyewaan")
+    g.set_titles("Musim: {col_name}")
+    g.add_legend(title="Tipe Hari")
+    g.figure.suptitle("Pola Penyewaan Sepeda per Jam Berdasarkan Musim dan Tipe Hari", y=1.03)
+    g.figure.tight_layout()
+    return g.figure
+
+
+def render_user_type(seasonal_user_type_melted):
+    fig, ax = plt.subplots(figsize=(12, 7))
+    sns.barplot(data=seasonal_user_type_melted, x='season', y='total_rentals_sum', hue='user_type', palette={'casual': 'orange', 'registered': 'green'}, ax=ax)
+    ax.set_title('Jumlah Pengguna Casual vs. Registered berdasarkan Musim')
+    ax.set_xlabel('Musim')
+    ax.set_ylabel('Total Penyewaan')
+    ax.tick_params(axis='x', rotation=0)
+    ax.legend(title='Tipe Pengguna')
+    ax.grid(axis='y', linestyle='--')
+    return fig
+
+
+def render_clustering(clustering):
+    fig, ax = plt.subplots(figsize=(15, 7))
+    sns.barplot(
+        data=clustering['monthly'],
+        x='year_month_str',
+        y='total_rentals',
+        hue='usage_cluster',
+        palette={'Rendah': 'lightblue', 'Sedang': 'orange', 'Tinggi': 'salmon'},
+        dodge=False,
+        ax=ax
+    )
+    ax.set_title('Total Penyewaan Sepeda Bulanan dengan Clustering Penggunaan')
+    ax.set_xlabel('Tahun-Bulan')
+    ax.set_ylabel('Total Penyewaan Sepeda')
+    ax.tick_params(axis='x', rotation=45)
+    ax.legend(title='Cluster Penggunaan')
+    ax.grid(True, axis='y', linestyle='--')
+    return fig
+
+
+def render_day_clustering(day_clustering):
+    fig, ax = plt.subplots(figsize=(12, 7))
+    palette = {'Rendah': 'lightblue', 'Sedang': 'orange', 'Tinggi': 'salmon'}
+    if day_clustering['days'] is not None:
+        sns.scatterplot(
+            data=day_clustering['days'],
+            x='registered',
+            y='casual',
+            hue='usage_cluster',
+            palette=palette,
+            alpha=0.7,
+            ax=ax
+        )
+    else:
+        grid = day_clustering['density']
+        mesh = ax.pcolormesh(grid['x_edges'], grid['y_edges'], np.ma.masked_equal(grid['counts'].T, 0), cmap='Greys')
+        fig.colorbar(mesh, ax=ax, label='Jumlah Hari')
+        for cluster, row in day_clustering['profile'].iterrows():
+            ax.scatter(row['registered'], row['casual'], s=250, color=palette[cluster], edgecolor='black', marker='X', label=cluster)
+    ax.set_title('Clustering Hari Berdasarkan Tipe Pengguna dan Cuaca (Mini-Batch K-Means)')
+    ax.set_xlabel('Penyewaan Registered Harian')
+    ax.set_ylabel('Penyewaan Casual Harian')
+    ax.legend(title='Cluster Penggunaan')
+    ax.grid(True, linestyle='--')
+    return fig
+
+
+# Daftar section sesuai urutan tampil di dashboard: nama -> (fungsi agregasi, fungsi render)
+SECTIONS = {
+    'metrics': (compute_metrics, None),
+    'seasonal': (compute_seasonal, render_seasonal),
+    'hourly': (compute_hourly, render_hourly),
+    'weather': (compute_weather, render_weather),
+    'monthly': (compute_monthly, render_monthly),
+    'weekday': (compute_weekday, render_weekday),
+    'correlation': (compute_correlation, render_correlation),
+    'weather_scatter': (compute_weather_scatter, render_weather_scatter),
+    'seasonal_hourly': (compute_seasonal_hourly, render_seasonal_hourly),
+    'user_type': (compute_user_type, render_user_type),
+    'clustering': (compute_clustering, render_clustering),
+    'day_clustering': (compute_day_clustering, render_day_clustering),
+}
+
+
+# Judul section di halaman dashboard dan laporan statis (grafik scatter cuaca berada di bawah judul bagian 6)
+SECTION_TITLES = {
+    'seasonal': "1. Total Penyewaan Sepeda Berdasarkan Musim dan Tahun",
+    'hourly': "2. Pola Penyewaan Sepeda Rata-Rata per Jam",
+    'weather': "3. Total Penyewaan Sepeda Berdasarkan Kondisi Cuaca dan Tahun",
+    'monthly': "4. Tren Penyewaan Sepeda Bulanan (2011-2012)",
+    'weekday': "5. Distribusi Penyewaan Harian berdasarkan Hari dalam Seminggu",
+    'correlation': "6. Dampak Variabel Cuaca Kontinu terhadap Total Penyewaan Harian",
+    'seasonal_hourly': "7. Pola Penyewaan per Jam Berdasarkan Musim dan Tipe Hari",
+    'user_type': "Analisis Tambahan: Proporsi Pengguna Casual vs. Registered berdasarkan Musim",
+    'clustering': "Analisis Lanjutan: Clustering Penggunaan Bulanan Berdasarkan Total Penyewaan",
+    'day_clustering': "Analisis Lanjutan: Clustering Hari Berdasarkan Tipe Pengguna dan Cuaca",
+}
+
+
+# Fungsi untuk mengambil keterangan aproksimasi (downsampling/binning) dari data section, jika ada
+def approximation_note(data):
+    if isinstance(data, pd.DataFrame):
+        return data.attrs.get('approximation')
+    if isinstance(data, dict):
+        return data.get('approximation')
+    return None
+
+
+def compute_section(name, ctx):
+    compute, _ = SECTIONS[name]
+    return compute(ctx)
+
+
+def has_figure(name):
+    return SECTIONS[name][1] is not None
+
+
+# Fungsi untuk merender figure section ke bytes gambar (png atau svg) lalu menutup figure
+def render_image(name, data, image_format='png'):
+    _, render = SECTIONS[name]
+    fig = render(data)
+    buffer = io.BytesIO()
+    dpi = min(FIGURE_DPI, MAX_IMAGE_WIDTH / fig.get_figwidth())
+    fig.savefig(buffer, format=image_format, bbox_inches='tight', dpi=dpi)
+    plt.close(fig)
+    if image_format == 'png':
+        return _fit_width(buffer.getvalue())
+    return buffer.getvalue()
+
+
+# bbox_inches='tight' bisa sedikit memperlebar gambar (mis. legenda FacetGrid), jadi dicek ulang
+def _fit_width(png_bytes):
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(png_bytes))
+    if image.width <= MAX_IMAGE_WIDTH:
+        return png_bytes
+    height = int(image.height * MAX_IMAGE_WIDTH / image.width)
+    buffer = io.BytesIO()
+    image.resize((MAX_IMAGE_WIDTH, height), resample=Image.BILINEAR).save(buffer, format='png')
+    return buffer.getvalue()
@@ -0,0 +1,250 @@
+import io
+import os
+import socket
+import threading
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+import data_store
+from etl import DAY_COLUMNS, HOUR_COLUMNS
+from filter_engine import FilterEngine, append_to_buffer
+from olap_cube import OlapCube, aggregate_cells, DAY_CUBE_DIMENSIONS, HOUR_CUBE_DIMENSIONS
+from moment_stats import MomentStats
+
+# Kolom harian yang dihitung dari data jam-an: cuaca kontinu dirata-rata, jumlah penyewaan dijumlahkan
+DAY_MEAN_COLUMNS = ['temperature', 'feeling_temperature', 'humidity', 'windspeed']
+DAY_SUM_COLUMNS = ['casual', 'registered', 'total_rentals']
+# Kolom yang konstan dalam satu hari; diambil dari jam pertama hari tersebut
+DAY_CONSTANT_COLUMNS = ['season', 'holiday', 'workingday']
+WEATHER_COLUMNS = [f'weather_{code}' for code in range(len(data_store.WEATHER_CATEGORIES))]
+
+# Cube harian dan statistik cukup menerima sel koreksi (negatif) setiap kali hari yang sudah ada diperbarui;
+# jika jumlah sel melebihi faktor ini x jumlah hari, cube dipadatkan ulang dari tabel harian
+CUBE_COMPACT_FACTOR = 4
+RECONNECT_DELAY = 2.0
+
+# Snapshot data streaming untuk satu rerun: versi data beserta sumber section (day_engine, day_cube, hour_cube,
+# day_stats). Cube dan statistik diperbarui di tempat oleh ingest(), jadi snapshot hanya konsisten selama
+# lock dataset dipegang dan versinya masih sama dengan versi dataset
+DataSnapshot = namedtuple('DataSnapshot', ['version', 'day_engine', 'day_cube', 'hour_cube', 'day_stats'])
+
+
+# Fungsi untuk mem-parse baris CSV (tanpa header) dengan skema dashboard_main_data_hour.csv
+def parse_records(lines, columns=HOUR_COLUMNS):
+    if not lines:
+        return None
+    text = ','.join(columns) + '\n' + ''.join(lines)
+    return data_store.read_csv_typed(io.StringIO(text))
+
+
+# Sumber stream dari file yang terus bertambah (tail -f): hanya baris utuh setelah offset terakhir yang dibaca
+class FileTailSource:
+    def __init__(self, path, from_start=False):
+        self.path = path
+        self._lock = threading.Lock()
+        self._offset = os.path.getsize(path) if not from_start and os.path.exists(path) else 0
+
+    def poll(self):
+        with self._lock:
+            if not os.path.exists(self.path):
+                return None
+            # File yang mengecil dianggap dirotasi/ditulis ulang: baca lagi dari awal
+            if os.path.getsize(self.path) < self._offset:
+                self._offset = 0
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                chunk = f.read()
+            complete = chunk[:chunk.rfind(b'\n') + 1]
+            self._offset += len(complete)
+        lines = complete.decode().splitlines(keepends=True)
+        header = ','.join(HOUR_COLUMNS)
+        return parse_records([line for line in lines if line.strip() and line.strip() != header])
+
+
+# Sumber stream dari socket TCP: thread latar belakang membaca baris CSV dan menampungnya
+# sampai dashboard mengambilnya dengan poll(); koneksi yang putus dicoba ulang
+class SocketSource:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self._lines = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        header = ','.join(HOUR_COLUMNS)
+        while not self._stop.is_set():
+            try:
+                with socket.create_connection((self.host, self.port)) as conn:
+                    for line in conn.makefile('r'):
+                        if self._stop.is_set():
+                            return
+                        if line.strip() and line.strip() != header:
+                            with self._lock:
+                                self._lines.append(line if line.endswith('\n') else line + '\n')
+            except OSError:
+                pass
+            self._stop.wait(RECONNECT_DELAY)
+
+    def poll(self):
+        with self._lock:
+            lines, self._lines = self._lines, []
+        return parse_records(lines)
+
+    def stop(self):
+        self._stop.set()
+
+
+# Sumber stream diatur lewat DASHBOARD_STREAM_SOURCE: path file CSV atau tcp://host:port
+def source_from_env():
+    spec = os.environ.get('DASHBOARD_STREAM_SOURCE', '')
+    if not spec:
+        return None
+    if spec.startswith('tcp://'):
+        host, port = spec[len('tcp://'):].rsplit(':', 1)
+        return SocketSource(host, int(port))
+    return FileTailSource(spec)
+
+
+# Dataset streaming: record jam-an baru ditambahkan ke cube jam-an dan ke akumulator per hari
+# dengan biaya sebanding jumlah record baru. Tabel harian diturunkan dari roll-up jam-an
+# (bukan file terpisah); cube harian diperbarui dengan sel delta untuk hari yang tersentuh.
+class StreamingDataset:
+    def __init__(self, hour_df):
+        self.lock = threading.RLock()
+        self.version = 0
+        self.rows_ingested = 0
+        self.hour_cube = OlapCube(hour_df, HOUR_CUBE_DIMENSIONS)
+        self._n_days = 0
+        self._dates = np.empty(0, dtype=hour_df['date'].to_numpy().dtype)
+        self._days = {col: np.zeros(0) for col in ['hours'] + DAY_MEAN_COLUMNS + DAY_SUM_COLUMNS + WEATHER_COLUMNS}
+        self._days.update({col: np.zeros(0, dtype=np.int8) for col in DAY_CONSTANT_COLUMNS})
+        self._merge_days(*self._aggregate_days(hour_df))
+        self._day_table = None
+        self._day_engine = None
+        self.day_cube = OlapCube(self.day_table(), DAY_CUBE_DIMENSIONS)
+        self.day_stats = MomentStats(self.day_table())
+
+    @property
+    def n_days(self):
+        return self._n_days
+
+    # Fungsi untuk meringkas record jam-an per tanggal (jumlah jam, jumlah ukuran, histogram cuaca)
+    def _aggregate_days(self, hours):
+        dates = hours['date'].to_numpy().astype(self._dates.dtype)
+        days, first, inverse = np.unique(dates, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        values = {'hours': np.bincount(inverse, minlength=len(days)).astype(np.float64)}
+        for col in DAY_MEAN_COLUMNS + DAY_SUM_COLUMNS:
+            values[col] = np.bincount(inverse, weights=hours[col].to_numpy(dtype=np.float64), minlength=len(days))
+        weather_codes = hours['weather_condition'].cat.codes.to_numpy()
+        for code, col in enumerate(WEATHER_COLUMNS):
+            values[col] = np.bincount(inverse, weights=weather_codes == code, minlength=len(days))
+        for col in DAY_CONSTANT_COLUMNS:
+            values[col] = hours[col].cat.codes.to_numpy()[first].astype(np.int8)
+        return days, values
+
+    # Fungsi untuk menggabungkan ringkasan harian ke akumulator; mengembalikan posisi hari yang tersentuh
+    def _merge_days(self, days, values):
+        n = self._n_days
+        positions = np.searchsorted(self._dates[:n], days)
+        existing = positions < n
+        existing[existing] = self._dates[positions[existing]] == days[existing]
+        for col, buffer in self._days.items():
+            if col not in DAY_CONSTANT_COLUMNS:
+                buffer[positions[existing]] += values[col][existing]
+
+        new_days = days[~existing]
+        if len(new_days):
+            if n == 0 or new_days[0] > self._dates[n - 1]:
+                self._dates = append_to_buffer(self._dates, n, new_days)
+                for col in self._days:
+                    self._days[col] = append_to_buffer(self._days[col], n, values[col][~existing])
+            else:
+                # Hari baru yang lebih awal dari hari terakhir (data terlambat): sisipkan di posisinya
+                at = positions[~existing]
+                self._dates = np.insert(self._dates[:n], at, new_days)
+                for col in self._days:
+                    self._days[col] = np.insert(self._days[col][:n], at, values[col][~existing])
+            self._n_days = n + len(new_days)
+        return np.searchsorted(self._dates[:self._n_days], days)
+
+    def _weather_codes(self, positions):
+        return np.argmax(np.column_stack([self._days[col][positions] for col in WEATHER_COLUMNS]), axis=1)
+
+    # Fungsi untuk membuat baris tabel harian (skema dashboard_main_data_day.csv) dari akumulator;
+    # cuaca harian diambil dari kondisi cuaca jam-an yang paling sering muncul pada hari itu
+    def _day_rows(self, positions):
+        dates = pd.DatetimeIndex(self._dates[positions])
+        df = pd.DataFrame({'date': dates})
+        df['season'] = pd.Categorical.from_codes(self._days['season'][positions], dtype=data_store.CATEGORICAL_DTYPES['season'])
+        df['year'] = dates.year
+        df['month'] = pd.Categorical.from_codes(dates.month - 1, dtype=data_store.CATEGORICAL_DTYPES['month'])
+        df['holiday'] = pd.Categorical.from_codes(self._days['holiday'][positions], dtype=data_store.CATEGORICAL_DTYPES['holiday'])
+        df['weekday'] = pd.Categorical.from_codes(dates.weekday, dtype=data_store.CATEGORICAL_DTYPES['weekday'])
+        df['workingday'] = pd.Categorical.from_codes(self._days['workingday'][positions], dtype=data_store.CATEGORICAL_DTYPES['workingday'])
+        df['weather_condition'] = pd.Categorical.from_codes(
+            self._weather_codes(positions), dtype=data_store.CATEGORICAL_DTYPES['weather_condition'])
+        for col in DAY_MEAN_COLUMNS:
+            df[col] = self._days[col][positions] / self._days['hours'][positions]
+        for col in DAY_SUM_COLUMNS:
+            df[col] = np.rint(self._days[col][positions])
+        df['month_num'] = dates.month
+        return data_store.apply_schema(df[DAY_COLUMNS])
+
+    # Fungsi untuk membuat sel cube harian dari baris harian (sign=-1 untuk sel koreksi)
+    def _day_cells(self, rows, sign=1):
+        cells = aggregate_cells(rows, DAY_CUBE_DIMENSIONS, self.day_cube.measures)
+        cells[self.day_cube.measures + ['row_count']] *= sign
+        return cells
+
+    # Fungsi untuk menambahkan batch record jam-an baru (biaya sebanding jumlah record baru)
+    def ingest(self, batch):
+        if batch is None or batch.empty:
+            return 0
+        batch = data_store.apply_schema(batch).sort_values(['date', 'hour'], kind='stable')
+        with self.lock:
+            self.hour_cube.append(batch)
+            days, values = self._aggregate_days(batch)
+            # Hari yang sudah ada: baris lamanya dibatalkan dengan sel negatif sebelum baris baru ditambahkan
+            old_rows = self._day_rows(np.intersect1d(self._dates[:self._n_days], days, return_indices=True)[1])
+            new_rows = self._day_rows(self._merge_days(days, values))
+            self.day_cube.append_cells(pd.concat([self._day_cells(old_rows, sign=-1), self._day_cells(new_rows)], ignore_index=True))
+            self.day_stats.append(old_rows, sign=-1)
+            self.day_stats.append(new_rows)
+            if len(self.day_cube) > CUBE_COMPACT_FACTOR * self._n_days:
+                day_table = self.day_table(refresh=True)
+                self.day_cube = OlapCube(day_table, DAY_CUBE_DIMENSIONS)
+                self.day_stats = MomentStats(day_table)
+            self._day_table = None
+            self._day_engine = None
+            self.version += 1
+            self.rows_ingested += len(batch)
+        return len(batch)
+
+    def snapshot(self):
+        with self.lock:
+            return DataSnapshot(self.version, self.day_engine, self.day_cube, self.hour_cube, self.day_stats)
+
+    # Fungsi untuk mengambil satu batch dari sumber stream lalu meng-ingest-nya
+    def poll(self, source):
+        return self.ingest(source.poll())
+
+    # Tabel harian hasil roll-up jam-an (dibuat ulang secara malas setelah ada data baru)
+    def day_table(self, refresh=False):
+        with self.lock:
+            if self._day_table is None or refresh:
+                self._day_table = self._day_rows(np.arange(self._n_days))
+            return self._day_table
+
+    # Mesin filter harian dibangun ulang secara malas hanya setelah ada data baru (ukurannya per hari, bukan per jam)
+    @property
+    def day_engine(self):
+        with self.lock:
+            if self._day_engine is None:
+                self._day_engine = FilterEngine(self.day_table())
+            return self._day_engine
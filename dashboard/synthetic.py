@@ -0,0 +1,281 @@
+import math
+import argparse
+
+import numpy as np
+import pandas as pd
+
+import data_store
+from etl import HOUR_COLUMNS
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+DEFAULT_STATION_SIGMA = 0.5
+
+N_SEASONS = len(data_store.SEASON_CATEGORIES)
+N_WEATHER = len(data_store.WEATHER_CATEGORIES)
+N_CELLS = N_SEASONS * 2 * 24
+
+
+def _cell_index(season, workingday, hour):
+    return (season * 2 + workingday) * 24 + hour
+
+
+# Fungsi untuk menghitung rata-rata dan simpangan baku per grup (vektor, lewat bincount)
+def _group_mean_std(groups, values, size, fallback=None):
+    counts = np.bincount(groups, minlength=size)
+    sums = np.bincount(groups, weights=values, minlength=size)
+    squares = np.bincount(groups, weights=values * values, minlength=size)
+    safe = np.maximum(counts, 1)
+    mean = sums / safe
+    std = np.sqrt(np.clip(squares / safe - mean * mean, 0, None))
+    if fallback is not None:
+        mean = np.where(counts > 0, mean, fallback[0])
+        std = np.where(counts > 1, std, fallback[1])
+    return mean, std, counts
+
+
+# Model generator yang dipelajari dari tabel jam-an (skema dashboard):
+# - profil jam-an log(1 + casual/registered) per musim x tipe hari x jam, efek cuaca, dan efek hari acak
+#   (korelasi residu casual-registered ikut dipelajari, sehingga porsi casual/registered terjaga)
+# - rantai Markov kondisi cuaca per musim dari transisi jam ke jam
+# - suhu: rata-rata bulanan + anomali harian AR(1) + offset per jam; suhu dirasakan ~ regresi linear suhu;
+#   kelembapan per cuaca x jam, kecepatan angin per cuaca
+# - kalender: musim dan hari libur per (bulan, tanggal) diambil dari data
+class HourModel:
+    def __init__(self, hour_df):
+        df = hour_df.sort_values(['date', 'hour'], kind='stable')
+        season = df['season'].cat.codes.to_numpy().astype(np.intp)
+        workingday = df['workingday'].cat.codes.to_numpy().astype(np.intp)
+        hour = df['hour'].astype(int).to_numpy()
+        weather = df['weather_condition'].cat.codes.to_numpy().astype(np.intp)
+        dates = df['date']
+        month = dates.dt.month.to_numpy() - 1
+        day = dates.dt.day.to_numpy() - 1
+        cells = _cell_index(season, workingday, hour)
+
+        # --- Jumlah penyewaan (skala log) ---
+        log_casual = np.log1p(df['casual'].to_numpy(dtype=np.float64))
+        log_registered = np.log1p(df['registered'].to_numpy(dtype=np.float64))
+        self.mu = {}
+        residuals = {}
+        for name, values in (('casual', log_casual), ('registered', log_registered)):
+            mean, _, _ = _group_mean_std(cells, values, N_CELLS, fallback=(values.mean(), values.std()))
+            self.mu[name] = mean
+            residuals[name] = values - mean[cells]
+        self.weather_effect = {}
+        for name in residuals:
+            effect, _, counts = _group_mean_std(weather, residuals[name], N_WEATHER)
+            # Kondisi cuaca yang (hampir) tidak pernah muncul memakai efek kondisi sebelumnya
+            for w in range(1, N_WEATHER):
+                if counts[w] < 10:
+                    effect[w] = effect[w - 1]
+            self.weather_effect[name] = effect
+            residuals[name] = residuals[name] - effect[weather]
+
+        # Efek hari (hari ramai/sepi) dipakai bersama casual dan registered, sisanya noise per jam
+        day_codes, day_index = np.unique(dates.to_numpy(), return_inverse=True)
+        day_index = day_index.reshape(-1)
+        day_mean, _, _ = _group_mean_std(day_index, (residuals['casual'] + residuals['registered']) / 2, len(day_codes))
+        self.day_sigma = float(day_mean.std())
+        self.sigma = {}
+        for name in residuals:
+            hourly = residuals[name] - day_mean[day_index]
+            _, std, _ = _group_mean_std(cells, hourly, N_CELLS, fallback=(0.0, hourly.std()))
+            self.sigma[name] = np.maximum(std, 0.05)
+            residuals[name] = hourly
+        self.rho = float(np.corrcoef(residuals['casual'], residuals['registered'])[0, 1])
+
+        # --- Transisi cuaca per musim (smoothing add-one) ---
+        transitions = np.ones((N_SEASONS, N_WEATHER, N_WEATHER))
+        np.add.at(transitions, (season[1:], weather[:-1], weather[1:]), 1)
+        self.weather_transitions = transitions / transitions.sum(axis=2, keepdims=True)
+        self.weather_start = np.bincount(weather, minlength=N_WEATHER) / len(weather)
+
+        # --- Suhu dan variabel cuaca kontinu ---
+        temperature = df['temperature'].to_numpy(dtype=np.float64)
+        daily_temp, _, _ = _group_mean_std(day_index, temperature, len(day_codes))
+        day_month = pd.DatetimeIndex(day_codes).month.to_numpy() - 1
+        self.temp_month_mean, _, _ = _group_mean_std(day_month, daily_temp, 12, fallback=(daily_temp.mean(), 0.0))
+        anomaly = daily_temp - self.temp_month_mean[day_month]
+        self.temp_phi = float(np.corrcoef(anomaly[:-1], anomaly[1:])[0, 1])
+        self.temp_sigma = float(anomaly.std() * math.sqrt(max(1 - self.temp_phi ** 2, 0.0)))
+        hour_offset, _, _ = _group_mean_std(month * 24 + hour, temperature - daily_temp[day_index], 12 * 24, fallback=(0.0, 0.0))
+        self.temp_hour_offset = hour_offset.reshape(12, 24)
+
+        atemp = df['feeling_temperature'].to_numpy(dtype=np.float64)
+        self.atemp_slope, self.atemp_intercept = np.polyfit(temperature, atemp, 1)
+        self.atemp_sigma = float((atemp - (self.atemp_intercept + self.atemp_slope * temperature)).std())
+
+        humidity = df['humidity'].to_numpy(dtype=np.float64)
+        windspeed = df['windspeed'].to_numpy(dtype=np.float64)
+        self.humidity_mean, self.humidity_std, _ = _group_mean_std(
+            weather * 24 + hour, humidity, N_WEATHER * 24, fallback=(humidity.mean(), humidity.std()))
+        self.windspeed_mean, self.windspeed_std, _ = _group_mean_std(
+            weather, windspeed, N_WEATHER, fallback=(windspeed.mean(), windspeed.std()))
+
+        # --- Kalender: musim (mayoritas) dan hari libur per (bulan, tanggal) ---
+        season_votes = np.zeros((12 * 31, N_SEASONS))
+        np.add.at(season_votes, (month * 31 + day, season), 1)
+        self.season_by_day = season_votes.argmax(axis=1)
+        # Tanggal yang tidak ada di data memakai musim tanggal sebelumnya
+        for i in np.flatnonzero(season_votes.sum(axis=1) == 0):
+            self.season_by_day[i] = self.season_by_day[i - 1]
+        holiday = df['holiday'].astype(int).to_numpy()
+        self.holiday_by_day = np.zeros(12 * 31, dtype=bool)
+        self.holiday_by_day[(month * 31 + day)[holiday == 1]] = True
+
+    # Fungsi untuk membangkitkan data sintetis per chunk (generator DataFrame) dengan memori terbatas.
+    # Cuaca dan suhu dibagi semua stasiun; setiap stasiun punya faktor skala permintaan sendiri.
+    def generate(self, start_date, days, stations=1, chunk_rows=DEFAULT_CHUNK_ROWS, seed=0,
+                 station_sigma=DEFAULT_STATION_SIGMA):
+        rng = np.random.default_rng(seed)
+        station_scale = rng.normal(0.0, station_sigma, stations) if stations > 1 else np.zeros(1)
+        chunk_days = max(1, chunk_rows // (24 * stations))
+        start = pd.Timestamp(start_date).normalize()
+        weather_state = rng.choice(N_WEATHER, p=self.weather_start)
+        anomaly = 0.0
+        for first_day in range(0, days, chunk_days):
+            n_days = min(chunk_days, days - first_day)
+            dates = pd.date_range(start + pd.Timedelta(days=first_day), periods=n_days, freq='D')
+            chunk, weather_state, anomaly = self._generate_days(dates, stations, station_scale, rng, weather_state, anomaly)
+            yield chunk
+
+    # Fungsi untuk menjalankan rantai Markov cuaca per jam tanpa loop per jam:
+    # semua uniform diundi di depan, lalu untuk setiap jam dihitung kondisi berikutnya dari setiap kondisi
+    # yang mungkin (lookup transisi kumulatif). Transisi 24 jam dikomposisikan per hari, sehingga hanya
+    # kondisi awal tiap hari yang dijalankan berurutan; hasilnya sama persis dengan simulasi jam demi jam.
+    def _weather_chain(self, season, uniform, weather_state):
+        n_days = len(season)
+        cumulative = self.weather_transitions.cumsum(axis=2)[np.repeat(season, 24)]
+        step = (cumulative < uniform[:, None, None]).sum(axis=2)
+        step = np.minimum(step, N_WEATHER - 1).reshape(n_days, 24, N_WEATHER)
+        days = np.arange(n_days)[:, None]
+        day_map = np.broadcast_to(np.arange(N_WEATHER), (n_days, N_WEATHER))
+        for h in range(24):
+            day_map = step[days, h, day_map]
+        day_start = np.empty(n_days, dtype=np.intp)
+        for d, transition in enumerate(day_map.tolist()):
+            day_start[d] = weather_state
+            weather_state = transition[weather_state]
+        weather = np.empty((n_days, 24), dtype=np.intp)
+        state = day_start
+        for h in range(24):
+            state = step[days[:, 0], h, state]
+            weather[:, h] = state
+        return weather.reshape(-1), int(weather_state)
+
+    def _generate_days(self, dates, stations, station_scale, rng, weather_state, anomaly):
+        n_days = len(dates)
+        month = dates.month.to_numpy() - 1
+        calendar_day = month * 31 + dates.day.to_numpy() - 1
+        weekday = dates.weekday.to_numpy()
+        season = self.season_by_day[calendar_day]
+        holiday = self.holiday_by_day[calendar_day]
+        workingday = ((weekday < 5) & ~holiday).astype(np.intp)
+
+        # Cuaca per jam (rantai Markov) dan suhu harian (AR(1))
+        weather, weather_state = self._weather_chain(season, rng.random(n_days * 24), weather_state)
+        daily_anomaly = np.empty(n_days)
+        shocks = rng.normal(0.0, self.temp_sigma, n_days)
+        for d in range(n_days):
+            anomaly = self.temp_phi * anomaly + shocks[d]
+            daily_anomaly[d] = anomaly
+        hours = np.tile(np.arange(24), n_days)
+        hour_month = np.repeat(month, 24)
+        temperature = np.clip(np.repeat(self.temp_month_mean[month] + daily_anomaly, 24)
+                              + self.temp_hour_offset[hour_month, hours], 0.02, 1.0)
+        atemp = np.clip(self.atemp_intercept + self.atemp_slope * temperature
+                        + rng.normal(0.0, self.atemp_sigma, len(temperature)), 0.0, 1.0)
+        humidity = np.clip(rng.normal(self.humidity_mean[weather * 24 + hours], self.humidity_std[weather * 24 + hours]), 0.0, 1.0)
+        windspeed = np.clip(rng.normal(self.windspeed_mean[weather], self.windspeed_std[weather]), 0.0, 0.85)
+
+        # Jumlah penyewaan per (hari, jam, stasiun)
+        shape = (n_days, 24, stations)
+        cells = _cell_index(np.repeat(season, 24), np.repeat(workingday, 24), hours)
+        day_effect = rng.normal(0.0, self.day_sigma, (n_days, 1, stations))
+        z_casual = rng.standard_normal(shape)
+        z_registered = self.rho * z_casual + math.sqrt(1 - self.rho ** 2) * rng.standard_normal(shape)
+        counts = {}
+        for name, z in (('casual', z_casual), ('registered', z_registered)):
+            log_mean = (self.mu[name][cells] + self.weather_effect[name][weather]).reshape(n_days, 24, 1)
+            log_count = log_mean + day_effect + station_scale.reshape(1, 1, -1) + self.sigma[name][cells].reshape(n_days, 24, 1) * z
+            counts[name] = np.clip(np.rint(np.expm1(log_count)), 0, None).astype(np.int32).reshape(-1)
+
+        def per_row(values):
+            return np.repeat(values, stations)
+
+        row_dates = np.repeat(dates.to_numpy(), 24 * stations)
+        chunk = pd.DataFrame({
+            'date': row_dates,
+            'season': pd.Categorical.from_codes(per_row(np.repeat(season, 24)), dtype=data_store.CATEGORICAL_DTYPES['season']),
+            'year': np.repeat(dates.year.to_numpy(), 24 * stations),
+            'month': pd.Categorical.from_codes(per_row(hour_month), dtype=data_store.CATEGORICAL_DTYPES['month']),
+            'hour': per_row(hours),
+            'holiday': per_row(np.repeat(holiday.astype(int), 24)),
+            'weekday': pd.Categorical.from_codes(per_row(np.repeat(weekday, 24)), dtype=data_store.CATEGORICAL_DTYPES['weekday']),
+            'workingday': pd.Categorical.from_codes(per_row(np.repeat(workingday, 24)), dtype=data_store.CATEGORICAL_DTYPES['workingday']),
+            'weather_condition': pd.Categorical.from_codes(per_row(weather), dtype=data_store.CATEGORICAL_DTYPES['weather_condition']),
+            'temperature': per_row(np.round(temperature, 2)),
+            'feeling_temperature': per_row(np.round(atemp, 4)),
+            'humidity': per_row(np.round(humidity, 2)),
+            'windspeed': per_row(np.round(windspeed, 4)),
+            'casual': counts['casual'],
+            'registered': counts['registered'],
+            'total_rentals': counts['casual'] + counts['registered'],
+            'month_num': per_row(hour_month + 1),
+        })
+        chunk = data_store.apply_schema(chunk[HOUR_COLUMNS])
+        if stations > 1:
+            chunk['station'] = np.tile(np.arange(stations, dtype=np.int32), n_days * 24)
+        return chunk, weather_state, anomaly
+
+
+# Fungsi untuk menulis data sintetis ke CSV dan/atau store kolumnar, chunk demi chunk
+def write_synthetic(model, start_date, days, stations=1, csv_path=None, store_format=None,
+                    store_table='synthetic_hour', store_dir=data_store.STORE_DIR,
+                    chunk_rows=DEFAULT_CHUNK_ROWS, seed=0):
+    total_rows = days * 24 * stations
+    store_writer = data_store.StoreWriter(store_table, store_format, store_dir, total_rows) if store_format else None
+    csv_file = open(csv_path, 'w', newline='') if csv_path else None
+    rows = 0
+    try:
+        for chunk in model.generate(start_date, days, stations, chunk_rows, seed):
+            if csv_file is not None:
+                chunk.to_csv(csv_file, index=False, header=rows == 0, date_format='%Y-%m-%d')
+            if store_writer is not None:
+                store_writer.write(chunk)
+            rows += len(chunk)
+    finally:
+        if csv_file is not None:
+            csv_file.close()
+        if store_writer is not None:
+            store_writer.close()
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generator data sintetis bike sharing (skema dashboard_main_data_hour.csv).")
+    parser.add_argument("--rows", type=int, default=None, help="Target jumlah baris (dibulatkan ke hari penuh)")
+    parser.add_argument("--days", type=int, default=731, help="Jumlah hari (diabaikan jika --rows diisi)")
+    parser.add_argument("--stations", type=int, default=1, help="Jumlah stasiun (>1 menambah kolom 'station')")
+    parser.add_argument("--start", default="2011-01-01")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--csv", default=None, help="Path output CSV")
+    parser.add_argument("--store-format", choices=data_store.FORMATS, default=None, help="Tulis juga ke store kolumnar")
+    parser.add_argument("--store-table", default="synthetic_hour")
+    parser.add_argument("--store-dir", default=data_store.STORE_DIR)
+    args = parser.parse_args(argv)
+
+    if args.csv is None and args.store_format is None:
+        parser.error("Pilih minimal satu output: --csv atau --store-format")
+    days = math.ceil(args.rows / (24 * args.stations)) if args.rows else args.days
+    model = HourModel(data_store.load_table('hour'))
+    rows = write_synthetic(model, args.start, days, args.stations, args.csv, args.store_format,
+                           args.store_table, args.store_dir, args.chunk_rows, args.seed)
+    print(f"{rows:,} baris sintetis ({days} hari x 24 jam x {args.stations} stasiun) ditulis"
+          + (f" ke {args.csv}" if args.csv else "")
+          + (f" dan store {data_store.store_path(args.store_table, args.store_format, args.store_dir)}" if args.store_format else ""))
+
+
+if __name__ == "__main__":
+    main()